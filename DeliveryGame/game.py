@@ -222,8 +222,8 @@ class Game:
         self.packages_manager = PackagesManager(self.master, self.canvas, self.objects_manager)
 
         # create packages according to the transporter load
-        for d in self.transporter[self.current_transporter_index].get_load():
-            self.packages_manager.add_device(d['device'], d['units'])
+        for device, units in self.transporter[self.current_transporter_index].get_load():
+            self.packages_manager.add_device(device, units)
         # create the upper info text
         self.packages_manager.render_info_text()
 
@@ -0,0 +1,133 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import contextlib
+import multiprocessing
+
+from database import Database
+from packer import do_packing
+from strategies import AUTO, STRATEGIES
+
+# benchmark for the packing pipeline with generated catalogs
+# every stage is timed: reading the devices and the whole packing with "packer.do_packing"
+# (driver assignment, solving, saving the plan and printing the loads)
+# every size runs in a new process, so the peak memory of one size doesn't include the others
+# example: python benchmark.py --sizes demo,small --strategy auto --output results.jsonl
+
+# catalog sizes: (devices, transporters)
+# "demo" has the size of the demo data in the devices, transporter and driver windows
+SIZES = {
+    'demo': (10, 2),
+    'small': (100, 10),
+    'medium': (1000, 50),
+    'large': (10000, 200),
+    'huge': (100000, 1000),
+}
+
+
+# fills the database with a generated catalog
+# the same seed always creates the same catalog
+def create_catalog(db, device_count, transporter_count, seed):
+    rand = random.Random(seed)
+    db.create_devices(('Gerät ' + str(i + 1), rand.randint(50, 700), rand.randint(500, 4000), rand.randint(10, 90))
+                      for i in range(device_count))
+    for i in range(transporter_count):
+        db.create_transporter(1100)
+        db.create_driver(round(rand.uniform(60, 110), 1))
+    db.commit()
+
+
+# returns the peak memory of the process in MB
+def get_peak_memory():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux returns KB, macOS bytes
+    if sys.platform == 'darwin':
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+# runs the packing pipeline and times the stages
+# snapshot: read the devices from a catalog snapshot instead of the database in the "get_devices" stage,
+# "do_packing" always reads the database
+# returns a dict with the results
+def run(size, strategy, time_budget, seed, snapshot=False):
+    device_count, transporter_count = SIZES[size]
+    stages = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = Database(os.path.join(directory, 'benchmark.db'))
+        create_catalog(db, device_count, transporter_count, seed)
+
+        if snapshot:
+            # numpy is only imported if a snapshot is used
+            from catalog_snapshot import Snapshot, write_snapshot
+            write_snapshot(db, os.path.join(directory, 'snapshot'))
+
+        start = time.perf_counter()
+        if snapshot:
+            Snapshot(os.path.join(directory, 'snapshot')).get_catalog().get_devices()
+        else:
+            db.get_devices(sorted=True)
+        stages['get_devices'] = time.perf_counter() - start
+
+        # the packing reads the devices from the database again, not from the cache
+        db.invalidate('devices')
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = do_packing(db, strategy, time_budget)
+        stages['do_packing'] = time.perf_counter() - start
+
+        db.close()
+
+    return {
+        'size': size,
+        'devices': device_count,
+        'transporter': transporter_count,
+        'seed': seed,
+        'snapshot': snapshot,
+        'engine': result.get_engine(),
+        'stages': stages,
+        'wall_time': stages['do_packing'],
+        'peak_memory_mb': round(get_peak_memory(), 1),
+        'benefit': result.get_benefit(),
+        'upper_bound': result.get_upper_bound(),
+        'gap': result.get_gap(),
+        'free_capacity': sum(round(transporter.get_reaming_capacity()) for transporter in result.get_transporter()
+                             if transporter.get_driver()),
+    }
+
+
+# runs the size in a new process and returns the results of "run"
+# the peak memory of a process only grows, so every size needs its own process
+def run_in_process(size, strategy, time_budget, seed, snapshot=False):
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run, (size, strategy, time_budget, seed, snapshot))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark für die Ladelisten')
+    parser.add_argument('--sizes', default='demo,small,medium', help='Größen mit Komma getrennt: ' + ', '.join(SIZES))
+    parser.add_argument('--strategy', default=AUTO, choices=[AUTO] + list(STRATEGIES.keys()))
+    parser.add_argument('--time-budget', type=float, default=2, help='maximale Rechenzeit in Sekunden')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--snapshot', action='store_true', help='Geräte aus einem binären Snapshot lesen')
+    parser.add_argument('--output', help='Ergebnisse als JSON Lines speichern')
+    args = parser.parse_args()
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    for size in args.sizes.split(','):
+        result = run_in_process(size, args.strategy, args.time_budget, args.seed, args.snapshot)
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+    if args.output:
+        output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+import math
+import time
+
+from packing_result import PackingResult
+from packing import get_available_units, get_fractional_bound, pack_greedy
+
+
+# Branch and Bound class: packs all transporters together (multiple knapsack problem)
+# the units of the devices are shared by all transporters,
+# so a transporter doesn't take the devices that fit better on an other one
+class BranchAndBound:
+    def __init__(self, devices, capacities, time_budget=None, progress=None):
+        self.devices = devices
+        self.time_budget = time_budget
+        self.progress = progress
+
+        # round up the weights and round down the capacities to prevent overload
+        self.weights = [max(math.ceil(device.get_weight()), 1) for device in devices]
+        self.benefits = [device.get_benefit() for device in devices]
+        self.capacities = [math.floor(max(capacity, 0)) for capacity in capacities]
+
+        # devices without benefit are never packed
+        self.units = [u if self.benefits[i] > 0 else 0 for i, u in enumerate(get_available_units(devices))]
+
+        # devices sorted by the best ratio between benefit and weight
+        # the database order can have ties because of the integer division
+        self.order = sorted(range(len(devices)), key=lambda i: self.benefits[i] / self.weights[i], reverse=True)
+
+        # floor the bounds if every benefit is an integer
+        self.integral = all(float(b).is_integer() for b in self.benefits)
+
+        # capacity of all transporters after each transporter
+        self.later_capacities = [sum(self.capacities[t + 1:]) for t in range(len(self.capacities))]
+
+        # default values
+        self.nodes = 0
+        self.optimal = False
+        self.upper_bound = None
+        self.best_benefit = 0
+        self.best_counts = None
+
+    # returns two upper bounds for the node: (bound of all devices, best bound)
+    # truck: index of the transporter that is packed at the moment
+    # position: index in "order" of the next device for this transporter
+    def get_bounds(self, truck, position, reaming):
+        # the later transporters are still empty
+        later_capacity = self.later_capacities[truck]
+
+        # every device for every transporter
+        bound = get_fractional_bound(self.order, self.weights, self.benefits, self.units,
+                                     reaming[truck] + later_capacity)
+        best_bound = bound
+
+        # only the next devices for this transporter, every device for the later transporters
+        if position > 0:
+            split_bound = get_fractional_bound(self.order, self.weights, self.benefits, self.units, reaming[truck],
+                                               position)
+            split_bound = split_bound + get_fractional_bound(self.order, self.weights, self.benefits, self.units,
+                                                             later_capacity)
+            best_bound = min(bound, split_bound)
+
+        if self.integral:
+            # small tolerance for float rounding
+            return math.floor(bound + 1e-9), math.floor(best_bound + 1e-9)
+        return bound, best_bound
+
+    # saves the greedy result as first solution,
+    # so the result is never worse than the greedy algorithm
+    def set_start_solution(self):
+        index = {id(device): i for i, device in enumerate(self.devices)}
+        self.best_counts = [[0] * len(self.devices) for _ in self.capacities]
+        self.best_benefit = 0
+        for t, load in enumerate(pack_greedy(self.devices, self.capacities).get_loads()):
+            for device, units in load:
+                self.best_counts[t][index[id(device)]] = units
+                self.best_benefit = self.best_benefit + device.get_benefit() * units
+
+    # searches the best loads with a depth-first search
+    # every level of the search decides the units of one device on one transporter
+    # (level = transporter * devices + position), starting with the most units
+    def solve(self):
+        self.set_start_solution()
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+
+        n = len(self.order)
+        depth = len(self.capacities) * n
+        reaming = list(self.capacities)
+        units = self.units
+        packed = [0] * depth
+        benefit = 0
+
+        level = 0
+        descend = True
+        cut = False
+        while True:
+            self.nodes = self.nodes + 1
+            if self.nodes % 1000 == 0:
+                if deadline and time.perf_counter() > deadline:
+                    # time is up, the best solution so far is returned
+                    return self.get_result()
+                if self.progress:
+                    # all transporters are searched together, the current transporter of the search is shown
+                    self.progress.update(level // n, len(self.capacities), self.best_benefit)
+
+            if descend:
+                if level == depth:
+                    # all decisions are made: save the new best solution
+                    if benefit > self.best_benefit:
+                        self.save_solution(packed, benefit)
+                    descend = False
+                    continue
+
+                truck, position = divmod(level, n)
+                bound, best_bound = self.get_bounds(truck, position, reaming)
+                if level == 0:
+                    # the bound of the root node is the proven upper bound
+                    self.upper_bound = best_bound
+                if benefit + best_bound <= self.best_benefit:
+                    # this node can't improve the best solution
+                    # the bound of all devices only gets smaller with less units
+                    # on the last level, so the last level can be skipped too
+                    cut = benefit + bound <= self.best_benefit
+                    descend = False
+                    continue
+
+                # pack as many units as possible
+                i = self.order[position]
+                max_units = min(units[i], reaming[truck] // self.weights[i])
+                packed[level] = max_units
+                units[i] = units[i] - max_units
+                reaming[truck] = reaming[truck] - self.weights[i] * max_units
+                benefit = benefit + self.benefits[i] * max_units
+                level = level + 1
+            else:
+                # go back to the last decision with packed units
+                level = level - 1
+                if cut and level >= 0 and packed[level] > 0:
+                    benefit = benefit - self.unpack(level, packed[level], packed, reaming)
+                cut = False
+                while level >= 0 and packed[level] == 0:
+                    level = level - 1
+                if level < 0:
+                    # the whole tree was searched
+                    self.optimal = True
+                    self.upper_bound = self.best_benefit
+                    return self.get_result()
+
+                # pack one unit less and search again
+                benefit = benefit - self.unpack(level, 1, packed, reaming)
+                level = level + 1
+                descend = True
+
+    # removes units of the decision on the level
+    # returns the removed benefit
+    def unpack(self, level, count, packed, reaming):
+        truck, position = divmod(level, len(self.order))
+        i = self.order[position]
+        packed[level] = packed[level] - count
+        self.units[i] = self.units[i] + count
+        reaming[truck] = reaming[truck] + self.weights[i] * count
+        return self.benefits[i] * count
+
+    # saves the units of the current path as best solution
+    def save_solution(self, packed, benefit):
+        n = len(self.order)
+        self.best_benefit = benefit
+        self.best_counts = [[0] * n for _ in self.capacities]
+        for level in range(len(packed)):
+            truck, position = divmod(level, n)
+            self.best_counts[truck][self.order[position]] = packed[level]
+
+    # returns the best solution as result with the upper bound
+    # the loads are a list of (device, units) tuples for every transporter
+    def get_result(self):
+        if self.progress:
+            self.progress.update(len(self.capacities), len(self.capacities), self.best_benefit)
+        loads = []
+        for counts in self.best_counts:
+            load = []
+            for i in self.order:
+                if counts[i] > 0:
+                    load.append((self.devices[i], counts[i]))
+            loads.append(load)
+        return PackingResult(loads, self.upper_bound)
+
+
+# packs all transporters together with branch and bound
+# has the same signature as "pack_greedy"
+# if the time budget is over, the best solution so far is returned
+def pack_branch_and_bound(devices, capacities, time_budget=None, progress=None):
+    return BranchAndBound(devices, capacities, time_budget, progress).solve()
@@ -0,0 +1,41 @@
+import math
+
+from knapsack import get_profile, split_units
+from packing import get_available_units
+
+
+# Capacity Sweep class: answers "what if" questions for the transporter size
+# the best benefit of one transporter is calculated for every capacity
+# up to the maximum capacity in one dynamic programming pass,
+# so every capacity or driver can be looked up without packing again
+class CapacitySweep:
+    def __init__(self, devices, max_capacity_kg):
+        self.max_capacity_kg = max_capacity_kg
+
+        # round up the weights with "math.ceil" to prevent overload
+        weights = [max(math.ceil(device.get_weight()), 1) for device in devices]
+        benefits = [device.get_benefit() for device in devices]
+        units = [u if benefits[i] > 0 else 0 for i, u in enumerate(get_available_units(devices))]
+
+        capacity = math.floor(max_capacity_kg * 1000)
+        self.profile = get_profile(weights, benefits, split_units(weights, units, capacity), capacity)
+
+    # returns the best benefit of a transporter with the capacity in kg
+    # driver: the weight of the driver is subtracted, like on the transporter
+    def get_benefit(self, capacity_kg, driver=None):
+        capacity = capacity_kg * 1000
+        if driver:
+            capacity = capacity - driver.get_weight()
+        # round down with "math.floor" to prevent overload
+        capacity = math.floor(min(max(capacity, 0), len(self.profile) - 1))
+        return self.profile[capacity].item()
+
+    # returns the benefit-capacity curve as list of (capacity in kg, benefit) tuples
+    # step_kg: distance between the capacities of the curve
+    def get_curve(self, step_kg=1, driver=None):
+        curve = []
+        capacity_kg = 0
+        while capacity_kg <= self.max_capacity_kg:
+            curve.append((capacity_kg, self.get_benefit(capacity_kg, driver)))
+            capacity_kg = capacity_kg + step_kg
+        return curve
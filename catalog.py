@@ -0,0 +1,144 @@
+import numpy as np
+
+
+# Catalog class: the devices as struct of arrays for big instances
+# every column is one contiguous numpy array instead of one object per device:
+# ids, units, weights in g and benefits
+# code that works with device objects gets small views, see "DeviceView"
+# the units array is a copy, it is changed when the devices are packed
+# integral: {'weights': bool, 'benefits': bool} if it is known that all values are integers,
+# e.g. from a snapshot, then the columns are used without checking or copying them
+class Catalog:
+    def __init__(self, ids, names, units, weights, benefits, integral=None):
+        if integral is None:
+            integral = {}
+        self.ids = np.asarray(ids, dtype=np.int64)
+        # list of the names or a function that returns the name of the i-th device
+        self.names = names
+        self.units = np.array(units, dtype=np.int64)
+        # the values are returned as int by the views if the column is integral
+        self.weights, self.weights_integral = get_column(weights, integral.get('weights'))
+        self.benefits, self.benefits_integral = get_column(benefits, integral.get('benefits'))
+
+        # default values
+        self.views = None
+
+    # returns the number of devices
+    def get_count(self):
+        return len(self.ids)
+
+    # returns the name of the i-th device
+    def get_name(self, i):
+        if callable(self.names):
+            return self.names(i)
+        return self.names[i]
+
+    # returns a view for every device, the views have the methods of "Device"
+    # the same views are returned on every call
+    def get_devices(self):
+        if self.views is None:
+            self.views = [DeviceView(self, i) for i in range(self.get_count())]
+        return self.views
+
+    # returns the upper bound of the total benefit for all transporters, like "packing.get_upper_bound"
+    # the fractional bound is calculated with array operations
+    def get_upper_bound(self, capacities):
+        capacity = sum(max(c, 0) for c in capacities)
+        packable = (self.benefits > 0) & (self.units > 0)
+        weights = self.weights[packable]
+        benefits = self.benefits[packable]
+        units = self.units[packable]
+        order = np.argsort(-(benefits / weights), kind='stable')
+
+        # the total weight before every device, the first device that doesn't fit is packed partially
+        total_weights = np.cumsum(weights[order] * units[order])
+        full = np.searchsorted(total_weights, capacity, side='right')
+        bound = float(np.sum(benefits[order[:full]] * units[order[:full]]))
+        if full < len(order):
+            rest = capacity - (total_weights[full - 1] if full > 0 else 0)
+            bound = bound + float(benefits[order[full]] * rest / weights[order[full]])
+        # the benefit can't be a fraction if every benefit is an integer
+        if self.benefits_integral:
+            return int(np.floor(bound + 1e-9))
+        return bound
+
+    # returns the loads as compact (device index, units) arrays, one array per transporter
+    # loads: list of (device, units) tuples for every transporter, e.g. "PackingResult.get_loads"
+    def get_load_arrays(self, loads):
+        index = {id(view): view.index for view in self.get_devices()}
+        arrays = []
+        for load in loads:
+            array = np.zeros((len(load), 2), dtype=np.int64)
+            for j, (device, units) in enumerate(load):
+                array[j, 0] = index[id(device)]
+                array[j, 1] = units
+            arrays.append(array)
+        return arrays
+
+
+# returns (column, integral): the column as array and True if all values are integers
+# integral: True or False if it is already known, then the array isn't checked or copied
+def get_column(values, integral=None):
+    column = np.asarray(values)
+    if integral is not None:
+        return column, integral
+    if column.dtype.kind in 'iu':
+        return column.astype(np.int64, copy=False), True
+    column = column.astype(np.float64, copy=False)
+    return column, bool(len(column) > 0 and np.all(np.mod(column, 1) == 0))
+
+
+# Device View class: one device of a catalog with the methods of "Device"
+# only the catalog and the index are saved, the values are read from the arrays
+class DeviceView:
+    __slots__ = ('catalog', 'index')
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    # returns the database ID
+    def get_id(self):
+        return int(self.catalog.ids[self.index])
+
+    # returns the name
+    def get_name(self):
+        return self.catalog.get_name(self.index)
+
+    # returns the available units
+    def get_units(self):
+        return int(self.catalog.units[self.index])
+
+    def set_units(self, u):
+        self.catalog.units[self.index] = int(u)
+
+    # returns the weight in g
+    def get_weight(self):
+        if self.catalog.weights_integral:
+            return int(self.catalog.weights[self.index])
+        return self.catalog.weights[self.index].item()
+
+    # returns the benefit ("Nutzwert")
+    def get_benefit(self):
+        if self.catalog.benefits_integral:
+            return int(self.catalog.benefits[self.index])
+        return self.catalog.benefits[self.index].item()
+
+    # sets the available units, after the devices were packed
+    def pack(self, units):
+        self.catalog.units[self.index] = self.catalog.units[self.index] - units
+
+    # returns the type of the device
+    def get_type(self):
+        name = self.get_name()
+        if 'Mobiltelefon' in name:
+            return 'smartphone'
+        if 'Tablet' in name:
+            return 'tablet'
+        return 'notebook'
+
+    # returns an emoji that matches the device type
+    def get_emoji(self):
+        if self.get_type() == 'smartphone':
+            return '📱'
+        return '💻'
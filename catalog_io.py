@@ -0,0 +1,108 @@
+import sys
+import csv
+import json
+import argparse
+
+from database import Database
+
+
+# command line tool to import device catalogs and export loading lists as files
+# the files are read and written line by line, so the memory doesn't depend on the file size
+# CSV files have a header row, JSON lines files have one object per line
+# examples:
+# python catalog_io.py import database.db devices.csv --replace
+# python catalog_io.py export database.db loads.jsonl
+
+# columns of the device catalog files
+DEVICE_COLUMNS = ['name', 'units', 'weight', 'benefit']
+
+# columns of the loading list files
+LOAD_COLUMNS = ['transporter_id', 'device_id', 'name', 'units', 'weight', 'benefit']
+
+
+# returns True if the path is a JSON lines file, otherwise it is a CSV file
+def is_jsonl(path):
+    return path.endswith('.jsonl') or path.endswith('.json')
+
+
+# returns the (name, units, weight, benefit) tuples of a CSV stream
+def read_devices_csv(stream):
+    for row in csv.DictReader(stream):
+        yield tuple(row[column] for column in DEVICE_COLUMNS)
+
+
+# returns the (name, units, weight, benefit) tuples of a JSON lines stream
+def read_devices_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            d = json.loads(line)
+            yield tuple(d[column] for column in DEVICE_COLUMNS)
+
+
+# imports the devices of the file into the database in one transaction
+# returns the number of imported devices
+def import_devices(db, path, replace=False, chunk_size=10000):
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+    try:
+        if is_jsonl(path):
+            rows = read_devices_jsonl(stream)
+        else:
+            rows = read_devices_csv(stream)
+        return db.create_devices(rows, chunk_size, replace)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+# writes the loads of the plan to the file, one row per packed device
+# returns the number of written rows
+def export_loads(db, path, plan_id, chunk_size=10000):
+    stream = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+    count = 0
+    try:
+        writer = None
+        if not is_jsonl(path):
+            writer = csv.writer(stream)
+            writer.writerow(LOAD_COLUMNS)
+        for row in db.iter_plan_loads(plan_id, chunk_size):
+            if writer:
+                writer.writerow(row)
+            else:
+                stream.write(json.dumps(dict(zip(LOAD_COLUMNS, row)), ensure_ascii=False) + '\n')
+            count = count + 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerätekataloge importieren und Ladelisten exportieren')
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('database', help='SQLite Datenbank')
+    parser.add_argument('file', help='CSV oder JSON Lines (.jsonl) Datei, "-" für stdin/stdout')
+    parser.add_argument('--replace', action='store_true', help='alle Geräte vor dem Import löschen')
+    parser.add_argument('--plan', type=int, help='ID des Plans für den Export, sonst der letzte gültige Plan')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Zeilen pro Datenbankzugriff')
+    args = parser.parse_args()
+
+    db = Database(args.database)
+    if args.command == 'import':
+        count = import_devices(db, args.file, args.replace, args.chunk_size)
+        print('-> importierte Geräte: ' + str(count), file=sys.stderr)
+    else:
+        plan_id = args.plan
+        if plan_id is None:
+            plan = db.get_last_plan()
+            if plan is None:
+                print('Fehler: Kein gültiger Plan für den aktuellen Katalog gefunden', file=sys.stderr)
+                db.close()
+                sys.exit(1)
+            plan_id = plan[0]
+        count = export_loads(db, args.file, plan_id, args.chunk_size)
+        print('-> exportierte Ladelisten-Zeilen: ' + str(count), file=sys.stderr)
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
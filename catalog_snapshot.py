@@ -0,0 +1,182 @@
+import os
+import json
+import argparse
+import numpy as np
+
+from device import Device
+from catalog import Catalog
+from database import Database
+
+# binary snapshot of the device catalog for benchmark and scenario runs
+# a snapshot is a directory with one .npy file per column and a name table:
+# - ids.npy, units.npy (int64), weights.npy, benefits.npy (float64)
+# - names.bin (utf-8 names one after another) and name_offsets.npy (int64, count + 1)
+# - meta.json (version, device count, the fingerprint of the catalog and
+#   if all weights and benefits are integers, then the devices get int values like from the database)
+# the devices are saved in the order of "Database.get_devices(sorted=True)"
+# the columns are memory mapped, so opening a snapshot doesn't read the file and
+# processes that open the same snapshot share the pages of the operating system
+# example: python catalog_snapshot.py database.db snapshot
+
+# version of the snapshot format
+SNAPSHOT_VERSION = 1
+
+# names of the column files
+COLUMNS = {
+    'ids': np.int64,
+    'units': np.int64,
+    'weights': np.float64,
+    'benefits': np.float64,
+}
+
+
+# writes the devices of the database into the snapshot directory
+# the devices are read in chunks, so the memory doesn't depend on the catalog size
+# returns the number of devices
+def write_snapshot(db, directory, chunk_size=10000):
+    os.makedirs(directory, exist_ok=True)
+    count = db.fetchall('SELECT COUNT(*) FROM devices')[0][0]
+
+    columns = {}
+    for column, dtype in COLUMNS.items():
+        columns[column] = np.lib.format.open_memmap(os.path.join(directory, column + '.npy'), mode='w+',
+                                                    dtype=dtype, shape=(count,))
+    offsets = np.lib.format.open_memmap(os.path.join(directory, 'name_offsets.npy'), mode='w+',
+                                        dtype=np.int64, shape=(count + 1,))
+
+    i = 0
+    offset = 0
+    integral = {'weights': True, 'benefits': True}
+    rows = db.iter_rows('SELECT ID, name, units, weight, benefit FROM devices ORDER BY efficiency DESC, ID',
+                        chunk_size=chunk_size)
+    with open(os.path.join(directory, 'names.bin'), 'wb') as names:
+        for device_id, name, units, weight, benefit in rows:
+            columns['ids'][i] = device_id
+            columns['units'][i] = units
+            columns['weights'][i] = weight
+            columns['benefits'][i] = benefit
+            integral['weights'] = integral['weights'] and float(weight).is_integer()
+            integral['benefits'] = integral['benefits'] and float(benefit).is_integer()
+            name = str(name).encode('utf-8')
+            names.write(name)
+            offsets[i] = offset
+            offset = offset + len(name)
+            i = i + 1
+    offsets[count] = offset
+
+    for array in list(columns.values()) + [offsets]:
+        array.flush()
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump({'version': SNAPSHOT_VERSION, 'count': count, 'fingerprint': db.get_fingerprint(),
+                   'integral': integral}, f)
+    return count
+
+
+# Snapshot class: read only view of a snapshot directory
+# the columns are numpy arrays that are mapped from the files (zero copy)
+class Snapshot:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        if self.meta['version'] != SNAPSHOT_VERSION:
+            raise ValueError('Snapshot Version ' + str(self.meta['version']) + ' wird nicht unterstützt')
+
+        self.columns = {}
+        for column in COLUMNS:
+            self.columns[column] = self.load(column + '.npy')
+        self.name_offsets = self.load('name_offsets.npy')
+
+        # the name table is only read if a name is needed
+        self.names = None
+
+    # maps the array file, an empty file can't be mapped
+    def load(self, filename):
+        path = os.path.join(self.directory, filename)
+        if self.meta['count'] == 0:
+            return np.load(path)
+        return np.load(path, mmap_mode='r')
+
+    # returns the number of devices
+    def get_count(self):
+        return self.meta['count']
+
+    # returns the fingerprint of the catalog, see "Database.get_fingerprint"
+    def get_fingerprint(self):
+        return self.meta['fingerprint']
+
+    # returns True if the snapshot has the same catalog as the database
+    def is_current(self, db):
+        return self.get_fingerprint() == db.get_fingerprint()
+
+    # returns the column arrays, the arrays are read only
+    def get_ids(self):
+        return self.columns['ids']
+
+    def get_units(self):
+        return self.columns['units']
+
+    def get_weights(self):
+        return self.columns['weights']
+
+    def get_benefits(self):
+        return self.columns['benefits']
+
+    # returns the values of the column as list, integers if all values are integers
+    def get_column_values(self, column):
+        if self.meta['integral'][column]:
+            return self.columns[column].astype(np.int64).tolist()
+        return self.columns[column].tolist()
+
+    # returns the name table as bytes
+    def get_name_table(self):
+        if self.names is None:
+            with open(os.path.join(self.directory, 'names.bin'), 'rb') as f:
+                self.names = f.read()
+        return self.names
+
+    # returns the name of the i-th device
+    def get_name(self, i):
+        return self.get_name_table()[self.name_offsets[i]:self.name_offsets[i + 1]].decode('utf-8')
+
+    # returns device objects for the solvers, sorted like "Database.get_devices(sorted=True)"
+    # demand: multiplier for the units of every device
+    # names: decode the names, the solvers don't need them
+    def get_devices(self, demand=1, names=True):
+        ids = self.get_ids().tolist()
+        units = np.floor(self.get_units() * demand).astype(np.int64).tolist()
+        weights = self.get_column_values('weights')
+        benefits = self.get_column_values('benefits')
+        if names:
+            table = self.get_name_table()
+            offsets = self.name_offsets.tolist()
+        devices = []
+        for i in range(len(ids)):
+            name = table[offsets[i]:offsets[i + 1]].decode('utf-8') if names else ''
+            devices.append(Device(ids[i], name, units[i], weights[i], benefits[i]))
+        return devices
+
+
+    # returns the devices as array backed catalog, see "catalog.Catalog"
+    # the IDs, weights and benefits are not copied, the names are only read if they are used
+    # demand: multiplier for the units of every device
+    def get_catalog(self, demand=1):
+        units = np.floor(self.get_units() * demand).astype(np.int64)
+        return Catalog(self.get_ids(), self.get_name, units, self.get_weights(), self.get_benefits(),
+                       self.meta['integral'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Binären Snapshot des Gerätekatalogs erstellen')
+    parser.add_argument('database', help='SQLite Datenbank')
+    parser.add_argument('directory', help='Ordner für den Snapshot')
+    args = parser.parse_args()
+
+    db = Database(args.database)
+    count = write_snapshot(db, args.directory)
+    db.close()
+    print('-> Geräte im Snapshot: ' + str(count))
+
+
+if __name__ == '__main__':
+    main()
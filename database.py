@@ -1,4 +1,6 @@
 import sqlite3
+import hashlib
+import itertools
 from device import Device
 from driver import Driver
 from transporter import Transporter
@@ -12,25 +14,155 @@ def parse_var(var, is_int=False):
         return str(var).replace('"', "'")
 
     if is_int:
-        try:
-            var = float(var)
-        except Exception as e:
-            var = 0
-        return str(var)
+        return str(parse_number(var))
+
+
+# returns the number of var: an int if the number has no decimal places, otherwise a float
+# returns 0 if var is no number
+def parse_number(var):
+    try:
+        var = float(var)
+    except Exception as e:
+        return 0
+    if var != var or var in (float('inf'), float('-inf')):
+        return 0
+    if var.is_integer():
+        return int(var)
+    return var
+
+
+# returns the efficiency (benefit per g) of a device
+# None (NULL) if the weight is 0
+def get_efficiency(weight, benefit):
+    if weight == 0:
+        return None
+    return benefit / weight
+
+
+# version of the database schema, saved in "PRAGMA user_version"
+# 1: devices with typed columns and the indexed efficiency (benefit per weight)
+# 2: versioned plans, loads and drivers belong to a plan
+# 3: the kind of the plan ("solver" or "online"), only solver plans are loaded as packing of the catalog
+SCHEMA_VERSION = 3
+
+# number of finished plans of every kind that are kept in the database
+KEEP_PLANS = 10
 
 
 class Database:
-    def __init__(self):
-        self.conn = sqlite3.connect('database.db')
+    # wal: use the write-ahead log, readers are not blocked while a plan is written
+    # threaded: the connection can be used by an other thread, e.g. the packing thread of the GUI,
+    # the threads must not use the database at the same time
+    def __init__(self, path='database.db', wal=False, threaded=False):
+        self.conn = sqlite3.connect(path, check_same_thread=not threaded)
         self.c = self.conn.cursor()
+        if wal:
+            self.c.execute('PRAGMA journal_mode=WAL')
+            self.c.execute('PRAGMA synchronous=NORMAL')
+
+        # rows of "loads" and "transporter_driver" that are written with the next commit
+        self.pending_loads = []
+        self.pending_drivers = []
+        # ID of the plan that gets the loads and drivers
+        self.plan_id = None
+
+        # cached rows of the catalog tables: table -> {command: rows}
+        # the rows are tuples, every get_* call creates new objects from them
+        self.cache = {}
+
+        self.create_tables()
+        self.migrate()
 
-        # remove old values
-        self.delete_all('loads')
-        self.delete_all('transporter_driver')
+    # creates the tables, if they don't exist
+    # needed for new database files
+    def create_tables(self):
+        self.c.execute('CREATE TABLE IF NOT EXISTS "loads" ("ID" INTEGER NOT NULL UNIQUE, "device_ID" INTEGER NOT NULL, '
+                       '"transporter_ID" INTEGER NOT NULL, "units" INTEGER, "plan" INTEGER, '
+                       'PRIMARY KEY("ID" AUTOINCREMENT))')
+        self.c.execute('CREATE TABLE IF NOT EXISTS "transporter_driver" ("ID" INTEGER NOT NULL UNIQUE, '
+                       '"driver_ID" INTEGER, "transporter_ID" INTEGER, "plan" INTEGER, PRIMARY KEY("ID" AUTOINCREMENT))')
+        # the fingerprint of the catalog is set when the plan is finished
+        # kind: "solver" for packings of the whole catalog, "online" for the online packer
+        self.c.execute('CREATE TABLE IF NOT EXISTS "plans" ("ID" INTEGER NOT NULL UNIQUE, "fingerprint" TEXT, '
+                       '"engine" TEXT, "benefit" NUMERIC, "upper_bound" NUMERIC, "kind" TEXT, '
+                       'PRIMARY KEY("ID" AUTOINCREMENT))')
+        self.c.execute('CREATE TABLE IF NOT EXISTS "devices" ("ID" INTEGER NOT NULL UNIQUE, "name" TEXT, '
+                       '"units" INTEGER, "weight" NUMERIC, "benefit" NUMERIC, "efficiency" REAL, '
+                       'PRIMARY KEY("ID" AUTOINCREMENT))')
+        self.c.execute('CREATE TABLE IF NOT EXISTS "transporter" ("ID" INTEGER NOT NULL UNIQUE, "capacity" INTEGER, '
+                       'PRIMARY KEY("ID" AUTOINCREMENT))')
+        self.c.execute('CREATE TABLE IF NOT EXISTS "driver" ("ID" INTEGER NOT NULL UNIQUE, "weight" INTEGER, '
+                       'PRIMARY KEY("ID" AUTOINCREMENT))')
+
+    # updates old database files to the current schema version
+    def migrate(self):
+        version = self.fetchall('PRAGMA user_version')[0][0]
+        if version < 1:
+            columns = [column[1] for column in self.fetchall('PRAGMA table_info("devices")')]
+            if 'efficiency' not in columns:
+                # old devices table: the numbers could be saved as strings in INTEGER columns,
+                # copy the devices into a new table with typed columns and the efficiency
+                self.c.execute('CREATE TABLE "devices_new" ("ID" INTEGER NOT NULL UNIQUE, "name" TEXT, '
+                               '"units" INTEGER, "weight" NUMERIC, "benefit" NUMERIC, "efficiency" REAL, '
+                               'PRIMARY KEY("ID" AUTOINCREMENT))')
+                self.c.execute('INSERT INTO devices_new(ID, name, units, weight, benefit, efficiency) '
+                               'SELECT ID, name, CAST(units AS INTEGER), CAST(weight AS NUMERIC), '
+                               'CAST(benefit AS NUMERIC), CAST(benefit AS REAL) / CAST(weight AS REAL) FROM devices')
+                self.c.execute('DROP TABLE devices')
+                self.c.execute('ALTER TABLE devices_new RENAME TO devices')
+
+        if version < 2:
+            for table in ['loads', 'transporter_driver']:
+                columns = [column[1] for column in self.fetchall('PRAGMA table_info("' + table + '")')]
+                if 'plan' not in columns:
+                    # the old loads were never kept after a restart
+                    self.c.execute('DELETE FROM ' + table)
+                    self.c.execute('ALTER TABLE ' + table + ' ADD COLUMN "plan" INTEGER')
+
+        if version < 3:
+            columns = [column[1] for column in self.fetchall('PRAGMA table_info("plans")')]
+            if 'kind' not in columns:
+                self.c.execute('ALTER TABLE plans ADD COLUMN "kind" TEXT')
+                self.c.execute('UPDATE plans SET kind = CASE WHEN engine = \'online\' THEN \'online\' '
+                               'ELSE \'solver\' END')
+
+        # the sorted devices are read with an index scan
+        self.c.execute('CREATE INDEX IF NOT EXISTS "devices_efficiency" ON "devices" ("efficiency" DESC, "ID")')
+        # the load and driver of one transporter in a plan are read with the index
+        self.c.execute('CREATE INDEX IF NOT EXISTS "loads_plan" ON "loads" ("plan", "transporter_ID")')
+        self.c.execute('CREATE INDEX IF NOT EXISTS "transporter_driver_plan" ON "transporter_driver" '
+                       '("plan", "transporter_ID")')
+        if version < SCHEMA_VERSION:
+            self.c.execute('PRAGMA user_version = ' + str(SCHEMA_VERSION))
+            self.conn.commit()
+
+    # writes the pending rows with prepared statements, but doesn't commit
+    def write_pending(self):
+        if len(self.pending_drivers) > 0:
+            self.c.executemany('INSERT INTO transporter_driver(driver_ID, transporter_ID, plan) VALUES (?, ?, ?)',
+                               self.pending_drivers)
+            self.pending_drivers = []
+        if len(self.pending_loads) > 0:
+            self.c.executemany('INSERT INTO loads(device_ID, transporter_ID, units, plan) VALUES (?, ?, ?, ?)',
+                               self.pending_loads)
+            self.pending_loads = []
+
+    # saves the changes and the pending rows in one transaction,
+    # if writing fails nothing of the plan is saved
+    def commit(self):
+        try:
+            with self.conn:
+                self.write_pending()
+        except Exception:
+            self.pending_loads = []
+            self.pending_drivers = []
+            # the cached rows could contain changes that were rolled back
+            self.cache = {}
+            raise
 
     # saves and closes the database
     def close(self):
-        self.conn.commit()
+        self.commit()
         self.conn.close()
 
     # returns the "fetchall" result of the command
@@ -38,14 +170,38 @@ class Database:
         self.c.execute(command)
         return self.c.fetchall()
 
+    # returns the rows of the command from the cache, the command is only executed
+    # if the table was changed since the last call
+    def fetch_cached(self, table, command):
+        commands = self.cache.setdefault(table, {})
+        if command not in commands:
+            commands[command] = self.fetchall(command)
+        return commands[command]
+
+    # removes the cached rows of the table, called by every write to the table
+    def invalidate(self, table):
+        self.cache.pop(table, None)
+
     # returns sorted array with device objects from database
     def get_devices(self, sorted=True):
         devices = []
         if sorted:
-            # select devices from SQL, sorted by the best (lowest) ratio between weight and profit
-            data = self.fetchall('SELECT * FROM devices ORDER BY weight/benefit')  # <- the magic
+            # select devices from SQL, sorted by the best (highest) ratio between profit and weight
+            # the efficiency is saved as REAL, so the order is exact, ties are sorted by ID
+            data = self.fetch_cached('devices', 'SELECT ID, name, units, weight, benefit FROM devices '
+                                                'ORDER BY efficiency DESC, ID')  # <- the magic
         else:
-            data = self.fetchall('SELECT * FROM devices')
+            data = self.fetch_cached('devices', 'SELECT ID, name, units, weight, benefit FROM devices')
+        for d in data:
+            # create device object
+            device = Device(d[0], d[1], d[2], d[3], d[4])
+            devices.append(device)
+        return devices
+
+    # returns array with the device objects that were created after the device ID
+    def get_devices_after(self, device_id):
+        devices = []
+        data = self.fetchall('SELECT ID, name, units, weight, benefit FROM devices WHERE ID > ' + str(int(device_id)) + ' ORDER BY ID')
         for d in data:
             # create device object
             device = Device(d[0], d[1], d[2], d[3], d[4])
@@ -55,7 +211,7 @@ class Database:
     # returns array with transporter objects from database
     def get_transporter(self):
         transporter = []
-        data = self.fetchall('SELECT * FROM transporter')
+        data = self.fetch_cached('transporter', 'SELECT * FROM transporter')
         for d in data:
             # create transporter object
             t = Transporter(d[0], d[1])
@@ -65,7 +221,7 @@ class Database:
     # returns array with driver objects from database
     def get_driver(self):
         driver = []
-        data = self.fetchall('SELECT * FROM driver')
+        data = self.fetch_cached('driver', 'SELECT * FROM driver')
         for d in data:
             # create driver object
             e = Driver(d[0], d[1])
@@ -73,17 +229,15 @@ class Database:
         return driver
 
     # save the driver of the transporter
+    # the row is written with the next commit
     def save_driver(self, driver, transporter):
         transporter.add_driver(driver)
-        self.c.execute(
-            'INSERT INTO transporter_driver(driver_ID, transporter_ID) VALUES (' + str(driver.get_id()) + ', ' + str(
-                transporter.get_id()) + ')')
+        self.pending_drivers.append((driver.get_id(), transporter.get_id(), self.plan_id))
 
     # saves new load to database
+    # the row is written with the next commit
     def save_load(self, device, units, transporter):
-        self.c.execute(
-            'INSERT INTO loads(device_ID, transporter_ID, units) VALUES (' + str(device.get_id()) + ', ' + str(
-                transporter.get_id()) + ', ' + str(units) + ')')
+        self.pending_loads.append((device.get_id(), transporter.get_id(), units, self.plan_id))
 
     # packs devices on the transporter
     def pack_device(self, device, units, transporter):
@@ -91,47 +245,211 @@ class Database:
         transporter.pack_device(device, units)
         self.save_load(device, units, transporter)
 
+    # returns the fingerprint of the catalog: devices, transporters and drivers
+    # the names are not part of the fingerprint, they don't change the packing
+    def get_fingerprint(self):
+        h = hashlib.sha256()
+        command = 'SELECT ID, name, units, weight, benefit FROM devices'
+        if command in self.cache.get('devices', {}):
+            devices = self.cache['devices'][command]
+        else:
+            # big catalogs are read in chunks and not cached
+            devices = self.iter_rows(command)
+        for d in devices:
+            h.update(repr((d[0], d[2], d[3], d[4])).encode())
+        h.update(b'transporter')
+        for d in self.fetch_cached('transporter', 'SELECT * FROM transporter'):
+            h.update(repr(d).encode())
+        h.update(b'driver')
+        for d in self.fetch_cached('driver', 'SELECT * FROM driver'):
+            h.update(repr(d).encode())
+        return h.hexdigest()
+
+    # starts a new plan, the next loads and drivers belong to the plan
+    # a plan that was started but not finished (e.g. a failed packing) is removed first
+    def start_plan(self):
+        if self.plan_id is not None:
+            self.cancel_plan()
+        self.write_pending()
+        self.c.execute('INSERT INTO plans(fingerprint) VALUES (NULL)')
+        self.plan_id = self.c.lastrowid
+        return self.plan_id
+
+    # finishes the plan and saves it in one transaction
+    # engine, benefit and upper bound: the values of the packing result
+    # kind: "solver" if the whole catalog was packed, only these plans are loaded by "get_last_plan"
+    # the plan is valid until the catalog changes, old plans are deleted
+    def finish_plan(self, engine, benefit, upper_bound=None, kind='solver'):
+        self.write_pending()
+        self.c.execute('UPDATE plans SET fingerprint = ?, engine = ?, benefit = ?, upper_bound = ?, kind = ? '
+                       'WHERE ID = ?', (self.get_fingerprint(), engine, benefit, upper_bound, kind, self.plan_id))
+        # old plans are deleted per kind, so online plans don't delete the last solver plan
+        self.c.execute('SELECT ID FROM plans WHERE fingerprint IS NOT NULL AND kind = ? ORDER BY ID DESC LIMIT -1 '
+                       'OFFSET ' + str(KEEP_PLANS), (kind,))
+        old_plans = self.c.fetchall()
+        for table in ['loads', 'transporter_driver']:
+            self.c.executemany('DELETE FROM ' + table + ' WHERE plan = ?', old_plans)
+        self.c.executemany('DELETE FROM plans WHERE ID = ?', old_plans)
+        self.commit()
+        self.plan_id = None
+
+    # removes the started plan, e.g. if the packing was cancelled
+    # the pending rows of the plan are not written
+    def cancel_plan(self):
+        self.pending_loads = []
+        self.pending_drivers = []
+        if self.plan_id is not None:
+            for table in ['loads', 'transporter_driver']:
+                self.c.execute('DELETE FROM ' + table + ' WHERE plan = ?', (self.plan_id,))
+            self.c.execute('DELETE FROM plans WHERE ID = ?', (self.plan_id,))
+            self.plan_id = None
+
+    # returns (plan ID, engine, upper bound) of the last finished plan of the kind for the current catalog,
+    # None if there is no plan or the catalog was changed since
+    def get_last_plan(self, kind='solver'):
+        self.c.execute('SELECT ID, engine, upper_bound FROM plans WHERE fingerprint = ? AND kind = ? '
+                       'ORDER BY ID DESC LIMIT 1', (self.get_fingerprint(), kind))
+        data = self.c.fetchall()
+        if len(data) == 0:
+            return None
+        return data[0]
+
+    # returns the (transporter ID, driver ID) tuples of the plan
+    def get_plan_driver(self, plan_id):
+        return self.fetchall('SELECT transporter_ID, driver_ID FROM transporter_driver WHERE plan = '
+                             + str(int(plan_id)) + ' ORDER BY ID')
+
+    # returns the (device ID, units) tuples of the transporter in the plan
+    def get_plan_load(self, plan_id, transporter_id):
+        self.c.execute('SELECT device_ID, units FROM loads WHERE plan = ? AND transporter_ID = ? ORDER BY ID',
+                       (plan_id, transporter_id))
+        return self.c.fetchall()
+
+    # returns the rows of the command, the rows are read in chunks with an own cursor,
+    # so the memory doesn't depend on the number of rows
+    def iter_rows(self, command, parameters=(), chunk_size=10000):
+        c = self.conn.cursor()
+        c.execute(command, parameters)
+        while True:
+            rows = c.fetchmany(chunk_size)
+            if len(rows) == 0:
+                break
+            for row in rows:
+                yield row
+        c.close()
+
+    # returns the loads of the plan joined with the devices, sorted by transporter:
+    # (transporter ID, device ID, name, units, weight, benefit) tuples
+    def iter_plan_loads(self, plan_id, chunk_size=10000):
+        return self.iter_rows('SELECT loads.transporter_ID, loads.device_ID, devices.name, loads.units, '
+                              'devices.weight, devices.benefit FROM loads JOIN devices ON devices.ID = loads.device_ID '
+                              'WHERE loads.plan = ? ORDER BY loads.transporter_ID, loads.ID', (plan_id,), chunk_size)
+
     # deletes every entry in given table
     def delete_all(self, table):
+        self.write_pending()
+        self.invalidate(table)
         self.c.execute('DELETE FROM ' + table)
 
     def delete_one(self, table, obj):
+        self.write_pending()
+        self.invalidate(table)
         self.c.execute('DELETE FROM ' + str(table) + ' WHERE ID = ' + str(obj.get_id()))
 
     # creates a new device
     def create_device(self, name, units, weight, benefit):
-        self.c.execute(
-            'INSERT INTO devices(name, units, weight, benefit) VALUES ("' + parse_var(name) + '", "' + parse_var(units,
-                                                                                                                 True) + '", "' + parse_var(
-                weight, True) + '", "' + parse_var(benefit, True) + '")')
+        units = int(parse_number(units))
+        weight = parse_number(weight)
+        benefit = parse_number(benefit)
+        self.invalidate('devices')
+        self.c.execute('INSERT INTO devices(name, units, weight, benefit, efficiency) VALUES (?, ?, ?, ?, ?)',
+                       (parse_var(name), units, weight, benefit, get_efficiency(weight, benefit)))
         return Device(self.c.lastrowid, name, units, weight, benefit)
 
+    # creates many devices in one transaction, e.g. to import a catalog file
+    # rows: iterable of (name, units, weight, benefit) tuples, it is read in chunks,
+    # so a stream of any size only needs the memory of one chunk
+    # replace: delete all devices before, in the same transaction
+    # returns the number of created devices
+    def create_devices(self, rows, chunk_size=10000, replace=False):
+        self.write_pending()
+        self.invalidate('devices')
+        count = 0
+        rows = iter(rows)
+        with self.conn:
+            if replace:
+                self.c.execute('DELETE FROM devices')
+            while True:
+                chunk = []
+                for name, units, weight, benefit in itertools.islice(rows, chunk_size):
+                    units = int(parse_number(units))
+                    weight = parse_number(weight)
+                    benefit = parse_number(benefit)
+                    chunk.append((parse_var(name), units, weight, benefit, get_efficiency(weight, benefit)))
+                if len(chunk) == 0:
+                    break
+                self.c.executemany('INSERT INTO devices(name, units, weight, benefit, efficiency) '
+                                   'VALUES (?, ?, ?, ?, ?)', chunk)
+                count = count + len(chunk)
+        return count
+
     # updates a device entry
     def update_device(self, device, name, units, weight, benefit):
-        device.set_name(name)
-        device.set_units(units)
-        device.set_weight(weight)
-        device.set_benefit(benefit)
-        self.c.execute('UPDATE devices SET name = "' + parse_var(name) + '", units = "' + parse_var(units,
-                                                                                                    True) + '", weight = "' + parse_var(
-            weight, True) + '", benefit = "' + parse_var(benefit, True) + '"  WHERE ID = ' + str(device.get_id()))
+        self.update_devices([(device, name, units, weight, benefit)])
+
+    # updates many device entries with one statement
+    # changes: list of (device, name, units, weight, benefit) tuples
+    def update_devices(self, changes):
+        rows = []
+        for device, name, units, weight, benefit in changes:
+            units = int(parse_number(units))
+            weight = parse_number(weight)
+            benefit = parse_number(benefit)
+            device.set_name(name)
+            device.set_units(units)
+            device.set_weight(weight)
+            device.set_benefit(benefit)
+            rows.append((parse_var(name), units, weight, benefit, get_efficiency(weight, benefit), device.get_id()))
+        self.invalidate('devices')
+        self.c.executemany('UPDATE devices SET name = ?, units = ?, weight = ?, benefit = ?, efficiency = ? '
+                           'WHERE ID = ?', rows)
 
     # creates a new transporter
     def create_transporter(self, capacity):
+        self.invalidate('transporter')
         self.c.execute('INSERT INTO transporter(capacity) VALUES ("' + parse_var(capacity, True) + '")')
 
     # updates a transporter entry
     def update_transporter(self, transporter, capacity):
-        transporter.set_capacity(capacity)
-        self.c.execute('UPDATE transporter SET capacity = "' + parse_var(capacity, True) + '" WHERE ID = ' + str(
-            transporter.get_id()))
+        self.update_transporters([(transporter, capacity)])
+
+    # updates many transporter entries with one statement
+    # changes: list of (transporter, capacity) tuples
+    def update_transporters(self, changes):
+        rows = []
+        for transporter, capacity in changes:
+            capacity = parse_number(capacity)
+            transporter.set_capacity(capacity)
+            rows.append((capacity, transporter.get_id()))
+        self.invalidate('transporter')
+        self.c.executemany('UPDATE transporter SET capacity = ? WHERE ID = ?', rows)
 
     # creates a new driver
     def create_driver(self, weight):
+        self.invalidate('driver')
         self.c.execute('INSERT INTO driver(weight) VALUES ("' + parse_var(weight, True) + '")')
 
     # updates a driver entry
     def update_driver(self, driver, weight):
-        driver.set_weight(weight)
-        self.c.execute(
-            'UPDATE driver SET weight = "' + parse_var(weight, True) + '" WHERE ID = ' + str(driver.get_id()))
+        self.update_drivers([(driver, weight)])
+
+    # updates many driver entries with one statement
+    # changes: list of (driver, weight) tuples
+    def update_drivers(self, changes):
+        rows = []
+        for driver, weight in changes:
+            weight = parse_number(weight)
+            driver.set_weight(weight)
+            rows.append((weight, driver.get_id()))
+        self.invalidate('driver')
+        self.c.executemany('UPDATE driver SET weight = ? WHERE ID = ?', rows)
@@ -1,8 +1,11 @@
 class Device:
+    # fixed attributes without __dict__, less memory for big catalogs
+    __slots__ = ('id', 'name', 'units', 'weight', 'benefit')
+
     def __init__(self, device_id, name, units, weight, benefit):
         self.id = device_id
         self.name = name
-        self.units = units
+        self.units = int(units)
         self.weight = weight
         self.benefit = benefit
 
@@ -22,11 +25,10 @@ class Device:
     # if a device gets packet on the transporter,
     # the available units will decrease
     def get_units(self):
-        self.units = int(self.units)
         return self.units
 
     def set_units(self, u):
-        self.units = u
+        self.units = int(u)
 
     # returns the weight in g
     def get_weight(self):
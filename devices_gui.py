@@ -29,8 +29,7 @@ class DevicesGUI(TableWindow):
 
     # delete button callback
     def on_delete(self, row):
-        device_id = self.devices[row - 1].get_id()
-        self.db.delete_one('devices', device_id)
+        self.db.delete_one('devices', self.devices[row - 1])
         self.reload()
 
     # reset button callback
@@ -50,11 +49,11 @@ class DevicesGUI(TableWindow):
 
     # done button callback
     def on_done(self):
-        i = -1
-        for row in self.row_vars:
-            self.db.update_device(self.devices[i], row[0].get(), row[1].get(), row[2].get(),
-                                  row[3].get())
-            i = i + 1
+        # save only the changed rows
+        changes = []
+        for i, row in self.get_changed_rows():
+            changes.append((self.devices[i], row[0], row[1], row[2], row[3]))
+        self.db.update_devices(changes)
         self.master.destroy()
 
     # creates a new device
@@ -1,4 +1,6 @@
 class Driver:
+    __slots__ = ('id', 'weight')
+
     def __init__(self, driver_id, weight):
         self.id = driver_id
         self.weight = weight
@@ -0,0 +1,111 @@
+import time
+
+from packing import get_upper_bound
+from strategies import AUTO, solve
+
+
+# returns the reaming capacity of every transporter with the driver
+def get_capacities(trucks, pairing):
+    return [t.get_total_capacity() - d.get_weight() for t, d in zip(trucks, pairing)]
+
+
+# returns the upper bound of the pairing:
+# every transporter on its own can't have more than its fractional bound (with all units),
+# all transporters together can't have more than the fractional bound of the fleet
+def get_pairing_bound(devices, capacities, fleet_bound):
+    single_bounds = sum(get_upper_bound(devices, [capacity]) for capacity in capacities)
+    return min(single_bounds, fleet_bound)
+
+
+# chooses the drivers of the transporters together with the loads
+# a lighter driver leaves more capacity, so the lightest drivers are used
+# and the transporters with the biggest capacity get a driver
+# the pairs are improved by swapping drivers between transporters with different capacities,
+# a swap is only packed if its upper bound can beat the best packing
+# progress: a "progress.Progress" for the packings, the best benefit so far is shown during the search
+# returns (pairs, result): the (transporter, driver) pairs in transporter order and the packing result
+def assign_drivers(transporter_list, driver, devices, strategy=AUTO, time_budget=2, local_search=False,
+                   progress=None):
+    # no deadline and no budget for the packings if the time budget is None (no limit)
+    deadline = None
+    if time_budget is not None:
+        deadline = time.perf_counter() + time_budget
+    count = min(len(transporter_list), len(driver))
+
+    # the lightest drivers, in database order
+    lightest = {id(d) for d in sorted(driver, key=lambda d: d.get_weight())[:count]}
+    pairing = [d for d in driver if id(d) in lightest]
+
+    # the biggest transporters, in database order
+    biggest = {id(t) for t in sorted(transporter_list, key=lambda t: t.get_total_capacity(), reverse=True)[:count]}
+    trucks = [t for t in transporter_list if id(t) in biggest]
+
+    # every pairing has the same total capacity
+    fleet_bound = get_upper_bound(devices, [sum(get_capacities(trucks, pairing))])
+
+    # the pairs can only be improved if the transporters and the drivers are different
+    if len({t.get_total_capacity() for t in trucks}) <= 1 or len({d.get_weight() for d in pairing}) <= 1:
+        # only one packing, it gets the whole time budget
+        best = solve(strategy, devices, get_capacities(trucks, pairing), time_budget, local_search=local_search,
+                     progress=progress)
+        return list(zip(trucks, pairing)), best
+
+    # some time for every packing, the rest for the search
+    packing_budget = None
+    if time_budget is not None:
+        packing_budget = time_budget / 10
+    best = solve(strategy, devices, get_capacities(trucks, pairing), packing_budget, local_search=local_search,
+                 progress=progress)
+    best_benefit = best.get_benefit()
+
+    # the bound of the packing is only proven for its pairing,
+    # other pairings are possible, so only the bound of the fleet is proven
+    best.set_upper_bound(fleet_bound)
+
+    improved = True
+    while improved and best_benefit < fleet_bound:
+        improved = False
+        for a in range(count):
+            for b in range(a + 1, count):
+                if deadline and time.perf_counter() > deadline:
+                    return list(zip(trucks, pairing)), best
+                if progress:
+                    progress.update(count, count, best_benefit)
+
+                # the swap doesn't change the capacities
+                if trucks[a].get_total_capacity() == trucks[b].get_total_capacity():
+                    continue
+                if pairing[a].get_weight() == pairing[b].get_weight():
+                    continue
+
+                swapped = list(pairing)
+                swapped[a], swapped[b] = swapped[b], swapped[a]
+                capacities = get_capacities(trucks, swapped)
+                if get_pairing_bound(devices, capacities, fleet_bound) <= best_benefit:
+                    continue
+
+                # the search only gets the time that is left
+                budget = packing_budget
+                if deadline:
+                    budget = min(packing_budget, max(deadline - time.perf_counter(), 0))
+                result = solve(strategy, devices, capacities, budget, local_search=local_search)
+                if result.get_benefit() > best_benefit:
+                    result.set_upper_bound(fleet_bound)
+                    best = result
+                    best_benefit = result.get_benefit()
+                    pairing = swapped
+                    improved = True
+
+    # the search is done before the deadline: the rest of the time budget
+    # is used to pack the best pairing again (without a limit every packing is already done)
+    rest = 0
+    if deadline:
+        rest = deadline - time.perf_counter()
+    if rest > 0 and best_benefit < fleet_bound:
+        result = solve(strategy, devices, get_capacities(trucks, pairing), rest, local_search=local_search,
+                       progress=progress)
+        if result.get_benefit() > best_benefit:
+            result.set_upper_bound(fleet_bound)
+            best = result
+
+    return list(zip(trucks, pairing)), best
@@ -41,10 +41,11 @@ class DriverGUI(TableWindow):
 
     # done button callback
     def on_done(self):
-        i = -1
-        for row in self.row_vars:
-            self.db.update_driver(self.driver[i], row[0].get())
-            i = i + 1
+        # save only the changed rows
+        changes = []
+        for i, row in self.get_changed_rows():
+            changes.append((self.driver[i], row[0]))
+        self.db.update_drivers(changes)
         self.master.destroy()
 
     # creates a new driver
@@ -1,12 +1,18 @@
+import queue
+import threading
 from tkinter import *
 from DeliveryGame.game import Game
 
 from driver_gui import DriverGUI
 from devices_gui import DevicesGUI
 from transporter_gui import TransporterGUI
+from progress import Progress, PackingCancelled
 
 
 # GUI class: handles the main GUI
+# do_packing_func: function that packs the transporters and returns a PackingResult,
+# it gets a "progress.Progress" and runs in an other thread, so the window isn't blocked
+# the database must be opened with "threaded=True"
 class GUI:
     def __init__(self, db, do_packing_func):
         self.db = db
@@ -18,15 +24,110 @@ class GUI:
         self.transporter = []
         self.animation_status = 0
         self.loads_unit_counts = [[0]]
+        # buttons that are disabled while packing, they use the database
+        self.buttons = []
+        # open editor windows, they are hidden while packing
+        self.editors = []
+        self.deliver_button = None
+        self.progress_label = None
+        self.cancel_button = None
+        # progress of the running packing, None if no packing is running
+        self.progress = None
+        self.packing_thread = None
+        # the window is closed when the cancelled packing thread is done
+        self.closing = False
+        # the packing thread puts (status, value) in the queue when it's done
+        self.packing_queue = queue.Queue()
 
     # closes the window and saves the database
     def close(self):
+        if self.progress:
+            # the packing thread uses the database, the window is closed
+            # when the cancelled packing is done, see "poll_packing"
+            self.progress.cancel()
+            self.closing = True
+            return
         self.db.close()
         self.master.destroy()
 
-    # starts the packing algorithm
+    # opens an editor window (a "TableWindow" class) for the database
+    def open_editor(self, editor_class):
+        self.editors = [editor for editor in self.editors if editor.is_open()]
+        self.editors.append(editor_class(self.db, self.master))
+
+    # starts the packing algorithm in an other thread
+    # the progress is shown until the result is done, see "poll_packing"
     def start_packing(self):
-        self.transporter = self.do_packing_func()
+        if self.progress:
+            return
+
+        self.progress = Progress()
+        for button in self.buttons:
+            button['state'] = DISABLED
+        if self.deliver_button:
+            self.deliver_button.destroy()
+            self.deliver_button = None
+        self.progress_label = Label(self.master, text='Packen...', bg='#2C2C2E', fg='white')
+        self.progress_label.place(x=150, y=12)
+        self.cancel_button = Button(self.master, text='Abbrechen', command=self.progress.cancel)
+        self.cancel_button.place(x=340, y=10)
+        # the editor windows write to the database, so they are hidden while packing
+        self.editors = [editor for editor in self.editors if editor.is_open()]
+        for editor in self.editors:
+            editor.hide()
+
+        self.packing_thread = threading.Thread(target=self.run_packing, args=(self.progress,), daemon=True)
+        self.packing_thread.start()
+        self.master.after(100, self.poll_packing)
+
+    # runs in the packing thread, the Tk objects must not be used here
+    def run_packing(self, progress):
+        try:
+            self.packing_queue.put(('done', self.do_packing_func(progress)))
+        except PackingCancelled:
+            self.packing_queue.put(('cancelled', None))
+        except Exception as e:
+            self.packing_queue.put(('error', e))
+
+    # shows the progress of the packing thread, until the result is done
+    # called by the Tk main loop every 100 ms
+    def poll_packing(self):
+        try:
+            status, value = self.packing_queue.get_nowait()
+        except queue.Empty:
+            transporter_done, transporter_count, benefit = self.progress.get_state()
+            text = 'Packen...'
+            if transporter_count > 0:
+                text = 'Transporter ' + str(transporter_done) + '/' + str(transporter_count) + \
+                       ', Nutzwert ' + str(benefit)
+            if self.progress.cancelled:
+                text = 'Abbrechen...'
+            self.progress_label['text'] = text
+            self.master.after(100, self.poll_packing)
+            return
+
+        self.progress = None
+        if self.closing:
+            self.close()
+            return
+
+        self.progress_label.destroy()
+        self.cancel_button.destroy()
+        for button in self.buttons:
+            button['state'] = NORMAL
+        for editor in self.editors:
+            editor.show()
+
+        if status == 'done':
+            self.show_result(value)
+        elif status == 'cancelled':
+            print('Packen abgebrochen')
+        else:
+            print('Fehler beim Packen: ' + str(value))
+
+    # shows the packed transporters of the result
+    def show_result(self, result):
+        self.transporter = result.get_transporter()
 
         t = 0
         self.loads_unit_counts = []
@@ -34,7 +135,7 @@ class GUI:
         # create counter for every device in load
         for transporter in self.transporter:
             self.loads_unit_counts.append([])
-            for item in transporter.get_load():
+            for device, units in transporter.get_load():
                 # set counter to 0
                 self.loads_unit_counts[t].append(0)
             t = t + 1
@@ -109,13 +210,12 @@ class GUI:
                 last_transporter_devices_count = len(self.transporter[t - 1].get_load())
 
             # for every item in transporter load
-            for item in transporter.get_load():
-                device = item['device']
+            for device, units in transporter.get_load():
 
                 # position, id and text
                 y_pos = i * 33 + 60 + last_transporter_devices_count * 52
                 canvas_id = 'transporter_' + str(t) + '_text_' + str(device.get_id())
-                canvas_text = device.get_name() + ': ' + str(item['units']) + ' Stück'
+                canvas_text = device.get_name() + ': ' + str(units) + ' Stück'
 
                 # place the counter text in canvas
                 self.canvas.create_text(0, y_pos, text='  ' + canvas_text, fill='white', tags=(canvas_id,),
@@ -130,8 +230,7 @@ class GUI:
         i = 0
         done = True
         # for every item in transporter load
-        for item in transporter.get_load():
-            device = item['device']
+        for device, units in transporter.get_load():
             device_text_id = 'transporter_' + str(t) + '_text_' + str(device.get_id())
 
             # move the counter to x = 10
@@ -141,7 +240,7 @@ class GUI:
                 self.canvas.move(device_text_id, 2, 0)
 
             # animate counter text if count is not done
-            if self.loads_unit_counts[t][i] < item['units']:
+            if self.loads_unit_counts[t][i] < units:
                 done = False
                 self.loads_unit_counts[t][i] = self.loads_unit_counts[t][i] + 1
 
@@ -188,7 +287,9 @@ class GUI:
 
     # renders the deliver button
     def render_deliver_button(self):
-        Button(self.master, text='Ausliefern', command=lambda: Game(self.master, self.transporter).render()).place(x=150, y=10)
+        self.deliver_button = Button(self.master, text='Ausliefern',
+                                     command=lambda: Game(self.master, self.transporter).render())
+        self.deliver_button.place(x=150, y=10)
 
     # renders the GUI
     def render(self):
@@ -198,11 +299,14 @@ class GUI:
         self.master.configure(background='#2C2C2E')
         self.master.protocol("WM_DELETE_WINDOW", self.close)
 
-        Button(self.master, text='Ladeliste erstellen', command=self.start_packing).place(x=10, y=10)
-        Button(self.master, text='Geräte bearbeiten', command=lambda: DevicesGUI(self.db, self.master)).place(x=10,
-                                                                                                              y=40)
-        Button(self.master, text='Transporter bearbeiten', command=lambda: TransporterGUI(self.db, self.master)).place(
-            x=150, y=40)
-        Button(self.master, text='Fahrer bearbeiten', command=lambda: DriverGUI(self.db, self.master)).place(x=340,
-                                                                                                             y=40)
+        self.buttons = [
+            Button(self.master, text='Ladeliste erstellen', command=self.start_packing),
+            Button(self.master, text='Geräte bearbeiten', command=lambda: self.open_editor(DevicesGUI)),
+            Button(self.master, text='Transporter bearbeiten', command=lambda: self.open_editor(TransporterGUI)),
+            Button(self.master, text='Fahrer bearbeiten', command=lambda: self.open_editor(DriverGUI)),
+        ]
+        self.buttons[0].place(x=10, y=10)
+        self.buttons[1].place(x=10, y=40)
+        self.buttons[2].place(x=150, y=40)
+        self.buttons[3].place(x=340, y=40)
         mainloop()
@@ -0,0 +1,193 @@
+from packer import do_packing, load_plan, get_cache_key, get_cache_entry, load_cached_result
+from packing import fill_greedy, get_upper_bound
+from packing_result import PackingResult
+from strategies import AUTO, solve
+from driver_assignment import assign_drivers
+
+
+# returns the values of the device that change the packing
+def get_device_values(device):
+    return device.get_units(), device.get_weight(), device.get_benefit()
+
+
+# Incremental Packer class: keeps the last packing and repairs it after changes
+# transporters that are not affected by the changes keep their loads,
+# only the affected transporters are packed again
+# cache: a "result_cache.ResultCache", a catalog that was already packed is not packed again
+class IncrementalPacker:
+    def __init__(self, db, strategy=AUTO, time_budget=2, cache=None):
+        self.db = db
+        self.strategy = strategy
+        self.time_budget = time_budget
+        self.cache = cache
+
+        # default values
+        # the catalog of the last packing: ID -> values
+        self.devices = {}
+        self.transporter = {}
+        self.driver = {}
+        # the last packing: transporter ID -> {'driver': driver ID, 'load': [(device ID, units), ...]}
+        self.plan = None
+
+    # saves the catalog and the packing as base for the next repair
+    # catalog: device ID -> values of the device before packing
+    def save_plan(self, catalog, transporter_list, driver):
+        self.devices = catalog
+        self.transporter = {t.get_id(): t.get_total_capacity_kg() for t in transporter_list}
+        self.driver = {d.get_id(): d.get_weight_kg() for d in driver}
+        self.plan = {}
+        for transporter in transporter_list:
+            driver_id = None
+            if transporter.get_driver():
+                driver_id = transporter.get_driver().get_id()
+            load = [(device.get_id(), units) for device, units in transporter.get_load()]
+            self.plan[transporter.get_id()] = {'driver': driver_id, 'load': load}
+
+    # packs all transporters from scratch
+    # only these results are saved in the cache, a repair can be worse than solving the catalog
+    def pack_all(self, progress=None):
+        catalog = {device.get_id(): get_device_values(device) for device in self.db.get_devices(False)}
+        result = do_packing(self.db, self.strategy, self.time_budget, progress=progress)
+        self.save_plan(catalog, result.get_transporter(), self.db.get_driver())
+        if self.cache:
+            self.cache.put(get_cache_key(self.db, self.strategy, self.time_budget), get_cache_entry(result))
+        return result
+
+    # packs the transporters, the last packing is repaired if possible
+    # after a restart the saved plan is used, if the catalog wasn't changed
+    # progress: a "progress.Progress" for the solver, see "do_packing"
+    # has the same return value as "do_packing"
+    def pack(self, progress=None):
+        if self.cache:
+            key = get_cache_key(self.db, self.strategy, self.time_budget)
+            entry = self.cache.get(key)
+            if entry:
+                catalog = {device.get_id(): get_device_values(device) for device in self.db.get_devices(False)}
+                result = load_cached_result(self.db, entry)
+                self.save_plan(catalog, result.get_transporter(), self.db.get_driver())
+                return result
+
+        if self.plan is None:
+            catalog = {device.get_id(): get_device_values(device) for device in self.db.get_devices(False)}
+            result = load_plan(self.db)
+            if result is None:
+                result = self.pack_all(progress)
+            else:
+                self.save_plan(catalog, result.get_transporter(), self.db.get_driver())
+        else:
+            result = self.repair(progress)
+        return result
+
+    # repairs the last packing after changes of devices, transporters or drivers
+    # if the packing is cancelled the last packing is kept
+    def repair(self, progress=None):
+        devices = self.db.get_devices(sorted=True)
+        transporter_list = self.db.get_transporter()
+        driver = self.db.get_driver()
+        driver_by_id = {d.get_id(): d for d in driver}
+        device_by_id = {device.get_id(): device for device in devices}
+        catalog = {device.get_id(): get_device_values(device) for device in devices}
+
+        # devices that were changed, created or deleted since the last packing
+        changed_devices = set()
+        for device_id, values in catalog.items():
+            if self.devices.get(device_id) != values:
+                changed_devices.add(device_id)
+        for device_id in self.devices:
+            if device_id not in catalog:
+                changed_devices.add(device_id)
+
+        # transporters that keep their load:
+        # same capacity, same driver and no changed device in the load
+        kept = {}
+        for transporter in transporter_list:
+            plan = self.plan.get(transporter.get_id())
+            if plan is None or plan['driver'] is None:
+                continue
+            if self.transporter[transporter.get_id()] != transporter.get_total_capacity_kg():
+                continue
+            d = driver_by_id.get(plan['driver'])
+            if d is None or self.driver[d.get_id()] != d.get_weight_kg():
+                continue
+            if any(device_id in changed_devices for device_id, units in plan['load']):
+                continue
+            kept[transporter.get_id()] = plan
+
+        # the units of the transporters that don't keep their load are free again,
+        # the kept transporters can take them like the units of changed devices
+        refill_devices = set(changed_devices)
+        for transporter_id, plan in self.plan.items():
+            if transporter_id not in kept:
+                refill_devices.update(device_id for device_id, units in plan['load'])
+
+        # the repaired packing is saved as new plan, with the kept loads
+        self.db.start_plan()
+
+        # set the kept loads
+        used_drivers = {plan['driver'] for plan in kept.values()}
+        free_driver = [d for d in driver if d.get_id() not in used_drivers]
+        free_transporter = []
+        for transporter in transporter_list:
+            if transporter.get_id() in kept:
+                plan = kept[transporter.get_id()]
+                self.db.save_driver(driver_by_id[plan['driver']], transporter)
+                for device_id, units in plan['load']:
+                    self.db.pack_device(device_by_id[device_id], units, transporter)
+            else:
+                free_transporter.append(transporter)
+
+        # the other transporters get the free drivers, chosen together with the loads
+        # of the reaming units like in "do_packing"
+        try:
+            pairs, result = assign_drivers(free_transporter, free_driver, devices, self.strategy, self.time_budget,
+                                           progress=progress)
+        except Exception:
+            # nothing of a cancelled or failed repair is saved
+            self.db.cancel_plan()
+            raise
+        repacked = []
+        for transporter, d in pairs:
+            self.db.save_driver(d, transporter)
+            repacked.append(transporter)
+        for transporter in free_transporter:
+            if transporter.get_driver() is None:
+                print('Fehler: Keinen Fahrer für Transporter Nr.' + str(transporter.get_id() + 1) + ' gefunden')
+
+        for transporter, load in zip(repacked, result.get_loads()):
+            for device, units in load:
+                self.db.pack_device(device, units, transporter)
+
+        # the kept transporters can take the reaming units of changed and released devices
+        changed = [device for device in devices if device.get_id() in refill_devices]
+        if len(changed) > 0:
+            units = [device.get_units() for device in changed]
+            for transporter in transporter_list:
+                if transporter.get_id() in kept:
+                    for device, u in fill_greedy(changed, units, transporter.get_reaming_capacity()):
+                        self.db.pack_device(device, u, transporter)
+
+        loads = [transporter.get_load() for transporter in transporter_list]
+
+        # the upper bound of the whole fleet with the units before packing
+        units = [catalog[device.get_id()][0] for device in devices]
+        capacities = [t.get_total_capacity() - t.get_driver().get_weight() for t in transporter_list if t.get_driver()]
+        repaired = PackingResult(loads, get_upper_bound(devices, capacities, units))
+
+        # the kept loads can block better devices, e.g. if a transporter lost its driver,
+        # the repair is only used if it isn't worse than the greedy algorithm on the whole catalog
+        if repaired.get_benefit() < solve('greedy', self.db.get_devices(sorted=True), capacities).get_benefit():
+            self.db.cancel_plan()
+            return self.pack_all(progress)
+
+        for transporter in transporter_list:
+            transporter.print_load()
+        repaired.set_engine('incremental ' + str(result.get_engine()))
+        repaired.set_runtime(result.get_runtime())
+        repaired.set_transporter(transporter_list)
+        repaired.set_devices(devices)
+        repaired.print_report()
+        # write the repaired plan in one transaction
+        self.db.finish_plan(repaired.get_engine(), repaired.get_benefit(), repaired.get_upper_bound())
+
+        self.save_plan(catalog, transporter_list, driver)
+        return repaired
@@ -0,0 +1,109 @@
+import math
+import time
+import numpy as np
+
+from packing_result import PackingResult
+from packing import get_available_units, get_loads_benefit, fill_greedy
+
+
+# splits the units of every device into packets of 1, 2, 4, ... units
+# (binary split), so every packet is a 0/1 item for the dynamic programming
+# returns a list of (device index, units) tuples
+def split_units(weights, units, capacity):
+    packets = []
+    for i in range(len(weights)):
+        # more units than fit on the transporter are never needed
+        remaining = min(units[i], capacity // weights[i])
+        size = 1
+        while remaining > 0:
+            packet_units = min(size, remaining)
+            packets.append((i, packet_units))
+            remaining = remaining - packet_units
+            size = size * 2
+    return packets
+
+
+# returns the best benefit for every capacity from 0 to capacity g as array
+# profile[c] is the best benefit with a capacity of c g,
+# it is updated row by row for every packet
+# decisions: if a list is given, the decisions are saved bit packed for the reconstruction
+# progress: a "progress.Progress", checked every 100 packets, so a cancel doesn't wait for the whole profile
+def get_profile(weights, benefits, packets, capacity, decisions=None, progress=None):
+    profile = np.zeros(capacity + 1, dtype=np.float64)
+    for p, (i, packet_units) in enumerate(packets):
+        if progress and p % 100 == 0:
+            progress.check()
+        weight = weights[i] * packet_units
+        candidate = profile[:-weight] + benefits[i] * packet_units
+        take = candidate > profile[weight:]
+        profile[weight:] = np.where(take, candidate, profile[weight:])
+        if decisions is not None:
+            decisions.append(np.packbits(take))
+    return profile
+
+
+# solves the bounded knapsack problem exactly
+# weights: integer weights in g, benefits: benefit per unit,
+# units: available units per device, capacity: integer capacity in g
+# progress: a "progress.Progress" that is checked for a cancel
+# returns the number of packed units for every device
+def solve_bounded_knapsack(weights, benefits, units, capacity, progress=None):
+    counts = [0] * len(weights)
+    if capacity <= 0:
+        return counts
+
+    # ignore devices without benefit, they only take capacity
+    units = [units[i] if benefits[i] > 0 else 0 for i in range(len(units))]
+    packets = split_units(weights, units, capacity)
+
+    decisions = []
+    get_profile(weights, benefits, packets, capacity, decisions, progress)
+
+    # walk the decisions backwards to get the packed units
+    c = capacity
+    for p in range(len(packets) - 1, -1, -1):
+        i, packet_units = packets[p]
+        weight = weights[i] * packet_units
+        if c >= weight:
+            bit = c - weight
+            if (decisions[p][bit >> 3] >> (7 - (bit & 7))) & 1:
+                counts[i] = counts[i] + packet_units
+                c = c - weight
+    return counts
+
+
+# packs the transporters one after another,
+# every transporter gets the optimal load for its capacity
+# has the same signature as "pack_greedy"
+# if the time budget is over, the other transporters are packed with the greedy algorithm
+def pack_knapsack(devices, capacities, time_budget=None, progress=None):
+    deadline = None
+    if time_budget is not None:
+        deadline = time.perf_counter() + time_budget
+
+    units = get_available_units(devices)
+    # round up the weights with "math.ceil" to prevent overload
+    weights = [max(math.ceil(device.get_weight()), 1) for device in devices]
+    benefits = [device.get_benefit() for device in devices]
+    loads = []
+    benefit = 0
+
+    for capacity in capacities:
+        if deadline and time.perf_counter() > deadline:
+            # time is up, pack the other transporters with the greedy algorithm
+            loads.append(fill_greedy(devices, units, capacity))
+        else:
+            # round down the capacity with "math.floor" to prevent overload
+            counts = solve_bounded_knapsack(weights, benefits, units, math.floor(max(capacity, 0)), progress)
+
+            load = []
+            for i in range(len(devices)):
+                if counts[i] > 0:
+                    load.append((devices[i], counts[i]))
+                    units[i] = units[i] - counts[i]
+            loads.append(load)
+
+        if progress:
+            benefit = benefit + get_loads_benefit(loads[-1:])
+            progress.update(len(loads), len(capacities), benefit)
+    return PackingResult(loads)
@@ -0,0 +1,149 @@
+import math
+import time
+
+from packing_result import PackingResult
+
+
+# Local Search class: improves a packing with small moves
+# - refill: pack unpacked units into the free capacity of a transporter
+# - replace: remove one packed unit and refill the transporter with better unpacked units
+# - move: move one unit to an other transporter and refill the free capacity
+# a move is only applied if it increases the benefit,
+# only the benefit and reaming capacity of the changed transporters are updated
+class LocalSearch:
+    def __init__(self, devices, capacities, loads):
+        self.devices = devices
+        self.weights = [device.get_weight() for device in devices]
+        self.benefits = [device.get_benefit() for device in devices]
+
+        # devices sorted by the best ratio, for the refill
+        self.order = sorted(range(len(devices)), key=lambda i: self.benefits[i] / self.weights[i], reverse=True)
+        self.rank = {i: r for r, i in enumerate(self.order)}
+
+        # packed units of every device on every transporter, reaming capacity and benefit
+        index = {id(device): i for i, device in enumerate(devices)}
+        self.counts = []
+        self.reaming = []
+        self.benefit = []
+        self.pool = [device.get_units() for device in devices]
+        for capacity, load in zip(capacities, loads):
+            counts = {}
+            reaming = capacity
+            benefit = 0
+            for device, units in load:
+                i = index[id(device)]
+                counts[i] = counts.get(i, 0) + units
+                reaming = reaming - self.weights[i] * units
+                benefit = benefit + self.benefits[i] * units
+                self.pool[i] = self.pool[i] - units
+            self.counts.append(counts)
+            self.reaming.append(reaming)
+            self.benefit.append(benefit)
+
+        # default values
+        self.moves = 0
+
+    # returns the benefit and the (device, units) plan to fill the capacity with unpacked units
+    # the plan is not applied
+    def get_refill(self, capacity, exclude=None):
+        gain = 0
+        plan = []
+        for i in self.order:
+            if capacity < 1:
+                break
+            if self.pool[i] > 0 and i != exclude and self.weights[i] <= capacity:
+                # round down with "math.floor" to prevent overload
+                units = min(math.floor(capacity / self.weights[i]), self.pool[i])
+                plan.append((i, units))
+                gain = gain + self.benefits[i] * units
+                capacity = capacity - self.weights[i] * units
+        return gain, plan
+
+    # packs units on the transporter (negative units remove them)
+    def apply(self, t, i, units):
+        self.counts[t][i] = self.counts[t].get(i, 0) + units
+        if self.counts[t][i] == 0:
+            del self.counts[t][i]
+        self.pool[i] = self.pool[i] - units
+        self.reaming[t] = self.reaming[t] - self.weights[i] * units
+        self.benefit[t] = self.benefit[t] + self.benefits[i] * units
+
+    # applies the refill plan on the transporter
+    def apply_refill(self, t, plan):
+        for i, units in plan:
+            self.apply(t, i, units)
+        self.moves = self.moves + 1
+
+    # refills the transporter, returns True if the benefit increased
+    def refill(self, t):
+        gain, plan = self.get_refill(self.reaming[t])
+        if gain > 0:
+            self.apply_refill(t, plan)
+            return True
+        return False
+
+    # removes one unit of the device, if the refill has a higher benefit
+    def replace(self, t, i):
+        gain, plan = self.get_refill(self.reaming[t] + self.weights[i], i)
+        if gain > self.benefits[i]:
+            self.apply(t, i, -1)
+            self.apply_refill(t, plan)
+            return True
+        return False
+
+    # moves one unit of the device to the other transporter, if the refill has a benefit
+    def move(self, s, t, i):
+        if self.reaming[t] < self.weights[i]:
+            return False
+        gain, plan = self.get_refill(self.reaming[s] + self.weights[i], i)
+        if gain > 0:
+            self.apply(s, i, -1)
+            self.apply(t, i, 1)
+            self.apply_refill(s, plan)
+            return True
+        return False
+
+    # runs the moves until no move improves the packing,
+    # the time budget is over or the maximum number of iterations is reached
+    # progress: a "progress.Progress" that is checked for a cancel before every transporter
+    def run(self, time_budget=None, max_iterations=100, progress=None):
+        deadline = None
+        if time_budget is not None:
+            deadline = time.perf_counter() + time_budget
+
+        for iteration in range(max_iterations):
+            improved = False
+            for t in range(len(self.counts)):
+                if deadline and time.perf_counter() > deadline:
+                    return
+                if progress:
+                    progress.check()
+                improved = self.refill(t) or improved
+                for i in list(self.counts[t]):
+                    if i in self.counts[t] and self.replace(t, i):
+                        improved = True
+                for s in range(len(self.counts)):
+                    if s != t:
+                        for i in list(self.counts[s]):
+                            if i in self.counts[s] and self.move(s, t, i):
+                                improved = True
+            if not improved:
+                return
+
+    # returns the loads as list of (device, units) tuples for every transporter
+    def get_loads(self):
+        loads = []
+        for counts in self.counts:
+            loads.append([(self.devices[i], counts[i]) for i in sorted(counts, key=lambda i: self.rank[i])])
+        return loads
+
+
+# improves the loads of the result with the local search
+# returns a new result with the same upper bound
+def improve(result, devices, capacities, time_budget=None, max_iterations=100, progress=None):
+    search = LocalSearch(devices, capacities, result.get_loads())
+    search.run(time_budget, max_iterations, progress)
+
+    improved = PackingResult(search.get_loads(), result.get_upper_bound())
+    improved.set_preprocessing(result.get_preprocessing())
+    return improved
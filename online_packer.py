@@ -0,0 +1,147 @@
+import sys
+import json
+import time
+import argparse
+
+from database import Database
+
+
+# Online Packer class: packs devices that arrive over time
+# the open transporters are partially filled, a transporter is dispatched
+# when its reaming capacity is smaller than the threshold
+# the loads are saved in the database as soon as the devices are packed
+# only the open transporters are kept in memory, not the devices that arrived
+class OnlinePacker:
+    def __init__(self, db, open_limit=5, threshold=1000):
+        self.db = db
+        # maximum number of transporters that are open at the same time
+        self.open_limit = open_limit
+        # reaming capacity in g that dispatches a transporter
+        self.threshold = threshold
+
+        # default values
+        self.open_transporter = []
+        self.dispatched = 0
+        self.unpacked_units = 0
+        self.benefit = 0
+
+        # the loads are saved in a new plan
+        db.start_plan()
+
+        # the transporters of the fleet, every transporter gets the next driver
+        self.waiting_transporter = list(zip(db.get_transporter(), db.get_driver()))
+        self.waiting_transporter.reverse()
+
+    # opens the next transporter of the fleet
+    # returns False if every transporter was used
+    def open_next(self):
+        if len(self.waiting_transporter) == 0 or len(self.open_transporter) >= self.open_limit:
+            return False
+        transporter, driver = self.waiting_transporter.pop()
+        self.db.save_driver(driver, transporter)
+        self.open_transporter.append(transporter)
+        return True
+
+    # returns True if the device fits on the next waiting transporter with its driver
+    def fits_next(self, device):
+        if len(self.waiting_transporter) == 0:
+            return False
+        transporter, driver = self.waiting_transporter[-1]
+        return transporter.get_total_capacity() - driver.get_weight() >= device.get_weight()
+
+    # dispatches the transporter: prints the load and closes it
+    def dispatch(self, transporter):
+        self.open_transporter.remove(transporter)
+        self.dispatched = self.dispatched + 1
+        self.benefit = self.benefit + transporter.get_benefit()
+        transporter.print_load()
+        self.db.commit()
+
+    # packs the units of a new device on the open transporters
+    # the transporter with the smallest reaming capacity that fits is used first (best fit),
+    # a new transporter is opened if no open transporter has space,
+    # if the open limit is reached the fullest transporter is dispatched first,
+    # but only if the device fits on the next transporter
+    def add_device(self, device):
+        units = device.get_units()
+        while units > 0:
+            fitting = [t for t in self.open_transporter if t.get_reaming_capacity() >= device.get_weight()]
+            if len(fitting) == 0:
+                if self.open_next():
+                    continue
+                if self.fits_next(device) and len(self.open_transporter) > 0:
+                    # no open transporter has space for the device, so it doesn't block the fleet
+                    self.dispatch(min(self.open_transporter, key=lambda t: t.get_reaming_capacity()))
+                    continue
+                break
+
+            transporter = min(fitting, key=lambda t: t.get_reaming_capacity())
+            packed = transporter.get_maximum_pacable_units(device)
+            self.db.pack_device(device, packed, transporter)
+            units = device.get_units()
+
+            if transporter.get_reaming_capacity() < self.threshold:
+                self.dispatch(transporter)
+
+        self.unpacked_units = self.unpacked_units + units
+
+    # dispatches all open transporters, e.g. at the end of the day
+    # the plan is finished with the catalog of all arrived devices,
+    # it is an online plan, so it isn't loaded as packing of the catalog
+    def close(self):
+        for transporter in list(self.open_transporter):
+            self.dispatch(transporter)
+        self.db.finish_plan('online', self.benefit, kind='online')
+        print('-> ausgelieferte Transporter: ' + str(self.dispatched))
+        print('-> nicht gepackte Geräte: ' + str(self.unpacked_units))
+
+
+# returns the devices of a JSON lines stream, one device per line:
+# {"name": "...", "units": 10, "weight": 1000, "benefit": 40}
+# every device is saved in the database
+def read_jsonl(db, stream):
+    for line in stream:
+        if line.strip():
+            d = json.loads(line)
+            yield db.create_device(d['name'], d['units'], d['weight'], d['benefit'])
+
+
+# returns the devices that are appended to the devices table
+# the table is checked every poll_interval seconds
+def follow_devices(db, poll_interval=1):
+    last_id = db.fetchall('SELECT MAX(ID) FROM devices')[0][0]
+    if last_id is None:
+        last_id = -1
+    while True:
+        devices = db.get_devices_after(last_id)
+        for device in devices:
+            last_id = max(last_id, device.get_id())
+            yield device
+        db.commit()
+        if len(devices) == 0:
+            time.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Geräte packen, sobald sie ankommen')
+    parser.add_argument('database', help='SQLite Datenbank mit Transportern und Fahrern')
+    parser.add_argument('--follow', action='store_true', help='neue Zeilen der Tabelle "devices" packen, '
+                                                              'sonst JSON Lines von stdin')
+    parser.add_argument('--open-limit', type=int, default=5, help='maximale Anzahl offener Transporter')
+    parser.add_argument('--threshold', type=float, default=1000, help='freie Kapazität in g zum Ausliefern')
+    args = parser.parse_args()
+
+    db = Database(args.database)
+    packer = OnlinePacker(db, args.open_limit, args.threshold)
+    devices = follow_devices(db) if args.follow else read_jsonl(db, sys.stdin)
+    try:
+        for device in devices:
+            packer.add_device(device)
+    except KeyboardInterrupt:
+        pass
+    packer.close()
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
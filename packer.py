@@ -0,0 +1,181 @@
+from packing import get_upper_bound
+from packing_result import PackingResult
+from strategies import AUTO, solve
+from result_cache import get_key
+from driver_assignment import assign_drivers
+
+
+# starts the packing algorithm
+# this function gets called by the GUI and the command line tool
+# strategy: name of a strategy in "strategies.STRATEGIES",
+# "auto" selects the strategy by the instance size
+# time_budget: maximum solving time in seconds, the best packing found so far is used
+# optimize_drivers: choose the drivers of the transporters together with the loads,
+# otherwise every transporter gets the next driver in database order
+# local_search: improve the packing with the local search afterwards
+# cache: a "result_cache.ResultCache", the same catalog with the same settings isn't solved again
+# progress: a "progress.Progress" that gets the progress of the solver, e.g. from the GUI,
+# if the packing is cancelled nothing is saved and "progress.PackingCancelled" is raised
+# returns a PackingResult with the transporter objects, the upper bound and the gap
+def do_packing(db, strategy=AUTO, time_budget=2, optimize_drivers=True, local_search=False, cache=None,
+               progress=None):
+    if cache:
+        key = get_cache_key(db, strategy, time_budget, optimize_drivers, local_search)
+        entry = cache.get(key)
+        if entry:
+            # the plan of the catalog is already saved in the database
+            return load_cached_result(db, entry)
+
+    # the loads and drivers are saved in a new plan
+    db.start_plan()
+    try:
+        result = pack_plan(db, strategy, time_budget, optimize_drivers, local_search, progress)
+    except Exception:
+        # nothing of a cancelled or failed packing is saved
+        db.cancel_plan()
+        raise
+
+    if cache:
+        cache.put(key, get_cache_entry(result))
+    return result
+
+
+# packs the transporters into the started plan and finishes it, see "do_packing"
+# returns the PackingResult
+def pack_plan(db, strategy, time_budget, optimize_drivers, local_search, progress):
+    # create driver and device objects
+    driver = db.get_driver()
+    devices = db.get_devices(sorted=True)
+    transporter_list = db.get_transporter()
+
+    if optimize_drivers:
+        pairs, result = assign_drivers(transporter_list, driver, devices, strategy, time_budget, local_search,
+                                       progress)
+    else:
+        # every transporter gets the next driver
+        pairs = list(zip(transporter_list, driver))
+        result = None
+
+    # for every transporter object
+    driven_transporter = []
+    for transporter, d in pairs:
+        db.save_driver(d, transporter)
+        driven_transporter.append(transporter)
+    for transporter in transporter_list:
+        # check if a driver is available for the truck
+        if transporter.get_driver() is None:
+            print('Fehler: Keinen Fahrer für Transporter Nr.' + str(transporter.get_id() + 1) + ' gefunden')
+
+    # calculate the loads of all transporters with a driver
+    capacities = [transporter.get_reaming_capacity() for transporter in driven_transporter]
+    if result is None:
+        result = solve(strategy, devices, capacities, time_budget, local_search=local_search, progress=progress)
+    if result.get_upper_bound() is None:
+        result.set_upper_bound(get_upper_bound(devices, capacities))
+
+    for transporter, load in zip(driven_transporter, result.get_loads()):
+        for device, units in load:
+            # pack the devices on the transporter
+            db.pack_device(device, units, transporter)
+
+        # print the load for the transporter
+        transporter.print_load()
+
+    result.print_report()
+    result.set_transporter(transporter_list)
+    result.set_devices(devices)
+
+    # write the whole plan in one transaction
+    db.finish_plan(result.get_engine(), result.get_benefit(), result.get_upper_bound())
+    return result
+
+
+# loads the last saved plan without solving,
+# returns a PackingResult like "do_packing" or None if the catalog was changed since the plan was saved
+def load_plan(db):
+    plan = db.get_last_plan()
+    if plan is None:
+        return None
+    plan_id, engine, upper_bound = plan
+    return build_result(db, db.get_plan_driver(plan_id), lambda transporter_id: db.get_plan_load(plan_id, transporter_id),
+                        engine, upper_bound)
+
+
+# creates the transporter objects with the saved drivers and loads, like after "do_packing"
+# pairs: (transporter ID, driver ID) tuples
+# get_load: function that returns the (device ID, units) tuples of a transporter ID
+# save: save the drivers and loads in the started plan of the database
+# returns a PackingResult
+def build_result(db, pairs, get_load, engine, upper_bound, save=False):
+    devices = db.get_devices(sorted=True)
+    device_by_id = {device.get_id(): device for device in devices}
+    driver_by_id = {d.get_id(): d for d in db.get_driver()}
+    transporter_list = db.get_transporter()
+    transporter_by_id = {transporter.get_id(): transporter for transporter in transporter_list}
+    for transporter_id, driver_id in pairs:
+        if save:
+            db.save_driver(driver_by_id[driver_id], transporter_by_id[transporter_id])
+        else:
+            transporter_by_id[transporter_id].add_driver(driver_by_id[driver_id])
+
+    loads = []
+    for transporter in transporter_list:
+        if transporter.get_driver() is None:
+            print('Fehler: Keinen Fahrer für Transporter Nr.' + str(transporter.get_id() + 1) + ' gefunden')
+            continue
+        load = []
+        for device_id, units in get_load(transporter.get_id()):
+            device = device_by_id[device_id]
+            if save:
+                db.pack_device(device, units, transporter)
+            else:
+                device.pack(units)
+                transporter.pack_device(device, units)
+            load.append((device, units))
+        loads.append(load)
+        transporter.print_load()
+
+    result = PackingResult(loads, upper_bound)
+    result.set_engine(engine)
+    result.print_report()
+    result.set_transporter(transporter_list)
+    result.set_devices(devices)
+    return result
+
+
+# returns the key of the packing in the result cache:
+# the fingerprint of the catalog (devices, transporters and drivers) and the solver settings
+def get_cache_key(db, strategy=AUTO, time_budget=2, optimize_drivers=True, local_search=False):
+    return get_key(db.get_fingerprint(), strategy, time_budget, optimize_drivers, local_search)
+
+
+# returns the result as plain values for the result cache
+def get_cache_entry(result):
+    pairs = []
+    loads = []
+    for transporter in result.get_transporter():
+        if transporter.get_driver():
+            pairs.append((transporter.get_id(), transporter.get_driver().get_id()))
+            loads.append((transporter.get_id(), [(device.get_id(), units) for device, units in transporter.get_load()]))
+    return {
+        'engine': result.get_engine(),
+        'upper_bound': result.get_upper_bound(),
+        'pairs': pairs,
+        'loads': loads,
+    }
+
+
+# returns the PackingResult of a cache entry, without solving
+# the result is saved as new plan, so it is the valid plan of the catalog like after solving
+# (the plan of the first packing could be deleted already)
+def load_cached_result(db, entry):
+    loads = {transporter_id: load for transporter_id, load in entry['loads']}
+    db.start_plan()
+    try:
+        result = build_result(db, entry['pairs'], lambda transporter_id: loads.get(transporter_id, []),
+                              str(entry['engine']) + ' (Cache)', entry['upper_bound'], save=True)
+        db.finish_plan(result.get_engine(), result.get_benefit(), result.get_upper_bound())
+    except Exception:
+        db.cancel_plan()
+        raise
+    return result
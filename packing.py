@@ -0,0 +1,137 @@
+import math
+import heapq
+from packing_result import PackingResult
+
+
+# every packing solver has the same signature:
+# solver(devices, capacities, time_budget, progress) -> PackingResult
+# devices: device objects, sorted by the best ratio first
+# capacities: reaming capacity in g for every transporter
+# time_budget: maximum solving time in seconds, None for no limit
+# progress: a "progress.Progress" that gets the packed transporters and the benefit so far, None for no progress,
+# the solver stops with "progress.PackingCancelled" if the packing was cancelled
+# the result contains a list of (device, units) tuples for every transporter
+
+
+# returns the available units of every device as list
+# the solvers work on this copy, the device objects
+# are only changed when the load gets packed
+def get_available_units(devices):
+    return [device.get_units() for device in devices]
+
+
+# returns the fractional (Dantzig) bound:
+# the items are packed in ratio order, the first item
+# that doesn't fit completely is packed partially
+def get_fractional_bound(order, weights, benefits, units, capacity, start=0):
+    bound = 0
+    for i in order[start:]:
+        if capacity <= 0:
+            break
+        if units[i] > 0:
+            weight = weights[i] * units[i]
+            if weight <= capacity:
+                bound = bound + benefits[i] * units[i]
+                capacity = capacity - weight
+            else:
+                bound = bound + benefits[i] * capacity / weights[i]
+                capacity = 0
+    return bound
+
+
+# returns the upper bound of the total benefit for all transporters:
+# the fractional bound of the ratio sorted devices with the total capacity
+# units: available units of every device, the units of the device objects by default
+def get_upper_bound(devices, capacities, units=None):
+    if units is None:
+        units = get_available_units(devices)
+    weights = [device.get_weight() for device in devices]
+    benefits = [device.get_benefit() if device.get_benefit() > 0 else 0 for device in devices]
+    order = sorted(range(len(devices)), key=lambda i: benefits[i] / weights[i], reverse=True)
+    capacity = sum(max(capacity, 0) for capacity in capacities)
+    bound = get_fractional_bound(order, weights, benefits, units, capacity)
+
+    # the benefit can't be a fraction if every benefit is an integer
+    if all(float(b).is_integer() for b in benefits):
+        # small tolerance for float rounding
+        return math.floor(bound + 1e-9)
+    return bound
+
+
+# packs one transporter with the greedy algorithm:
+# the transporter takes as many units of the best devices as possible
+# units: available units of every device, the packed units are subtracted
+# indices: the indices of the devices to check, all devices by default
+# returns a list of (device, units) tuples
+def fill_greedy(devices, units, capacity, indices=None):
+    if indices is None:
+        indices = range(len(devices))
+
+    load = []
+    for i in indices:
+        # check if any units of device are available to pack
+        if units[i] > 0:
+            # round down with "math.floor" to prevent overload
+            max_units = min(math.floor(max(capacity, 0) / devices[i].get_weight()), units[i])
+            if max_units > 0:
+                load.append((devices[i], max_units))
+                units[i] = units[i] - max_units
+                capacity = capacity - devices[i].get_weight() * max_units
+    return load
+
+
+# returns the benefit of the loads
+def get_loads_benefit(loads):
+    return sum(device.get_benefit() * units for load in loads for device, units in load)
+
+
+# packs the transporters one after another with the greedy algorithm
+# the greedy algorithm is fast enough to ignore the time budget
+def pack_greedy(devices, capacities, time_budget=None, progress=None):
+    units = get_available_units(devices)
+    loads = []
+    benefit = 0
+
+    # only the devices with available units are checked
+    indices = [i for i in range(len(devices)) if units[i] > 0]
+    for capacity in capacities:
+        load = fill_greedy(devices, units, capacity, indices)
+        if len(load) > 0:
+            indices = [i for i in indices if units[i] > 0]
+        loads.append(load)
+        if progress:
+            benefit = benefit + get_loads_benefit([load])
+            progress.update(len(loads), len(capacities), benefit)
+    return PackingResult(loads)
+
+
+# packs a big fleet with the greedy algorithm
+# the devices are packed in ratio order, every device goes on the transporter
+# with the most reaming capacity (priority queue), until no transporter has space for it
+# so every device is only checked once and exhausted devices are never checked again
+# the transporters are packed together, so the progress counts the transporters without space
+def pack_fleet_greedy(devices, capacities, time_budget=None, progress=None):
+    loads = [[] for _ in capacities]
+    benefit = 0
+
+    # max heap of (-reaming capacity, transporter index)
+    heap = [(-math.floor(max(capacity, 0)), t) for t, capacity in enumerate(capacities)]
+    heapq.heapify(heap)
+
+    for i, device in enumerate(devices):
+        units = device.get_units()
+        weight = device.get_weight()
+        while units > 0 and len(heap) > 0 and -heap[0][0] >= weight:
+            reaming, t = heapq.heappop(heap)
+            # round down with "math.floor" to prevent overload
+            packed = min(math.floor(-reaming / weight), units)
+            loads[t].append((device, packed))
+            units = units - packed
+            benefit = benefit + device.get_benefit() * packed
+            heapq.heappush(heap, (reaming + weight * packed, t))
+        if progress and i % 1000 == 0:
+            full = sum(1 for reaming, t in heap if -reaming < weight)
+            progress.update(full, len(capacities), benefit)
+    if progress:
+        progress.update(len(capacities), len(capacities), benefit)
+    return PackingResult(loads)
@@ -0,0 +1,95 @@
+import csv
+import json
+import argparse
+
+from database import Database
+from packer import do_packing
+from strategies import AUTO, STRATEGIES
+
+
+# command line tool to create the loading lists without the GUI
+# only needs sqlite3 and the solver, tkinter, pygame and pynput are never imported
+# example: python packing_cli.py database.db --json loads.json --csv loads.csv
+
+
+# returns the loading list of every transporter as list of dicts
+def get_loading_lists(result):
+    loading_lists = []
+    for transporter in result.get_transporter():
+        load = []
+        for device, units in transporter.get_load():
+            load.append({'device_id': device.get_id(), 'name': device.get_name(), 'units': units})
+        loading_lists.append({
+            'transporter_id': transporter.get_id(),
+            'benefit': transporter.get_benefit(),
+            'free_capacity': round(transporter.get_reaming_capacity()),
+            'load': load,
+        })
+    return loading_lists
+
+
+# writes the loading lists and the report to a JSON file
+def write_json(result, path):
+    data = {
+        'engine': result.get_engine(),
+        'runtime': result.get_runtime(),
+        'benefit': result.get_benefit(),
+        'upper_bound': result.get_upper_bound(),
+        'gap': result.get_gap(),
+        'transporter': get_loading_lists(result),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# writes the loading lists to a CSV file, one row per packed device
+def write_csv(result, path):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['transporter_id', 'device_id', 'name', 'units'])
+        for loading_list in get_loading_lists(result):
+            for item in loading_list['load']:
+                writer.writerow([loading_list['transporter_id'], item['device_id'], item['name'], item['units']])
+
+
+# prints the marginal values of the packing to the console
+def print_sensitivity(result):
+    sensitivity = result.get_sensitivity()
+    print('-> Nutzwert pro kg Kapazität: ' + str(round(sensitivity.get_capacity_price(), 2)))
+    for transporter in result.get_transporter():
+        text = '-> Transporter Nr.' + str(transporter.get_id() + 1) + ' +1 kg: ' \
+               + str(sensitivity.get_transporter_capacity_value(transporter))
+        if transporter.get_driver() is None:
+            text = text + ' (kein Fahrer)'
+        print(text)
+    for device in result.get_devices():
+        print('-> ' + device.get_name() + ': ' + str(round(sensitivity.get_device_price(device), 2))
+              + ' pro Einheit, ' + str(sensitivity.get_units_worth_adding(device)) + ' Einheiten lohnen sich')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ladelisten ohne GUI erstellen')
+    parser.add_argument('database', help='SQLite Datenbank mit Geräten, Transportern und Fahrern')
+    parser.add_argument('--strategy', default=AUTO, choices=[AUTO] + list(STRATEGIES.keys()))
+    parser.add_argument('--time-budget', type=float, default=2, help='maximale Rechenzeit in Sekunden')
+    parser.add_argument('--local-search', action='store_true', help='Ladelisten mit lokaler Suche verbessern')
+    parser.add_argument('--sensitivity', action='store_true', help='Grenznutzen der Kapazität und Geräte ausgeben')
+    parser.add_argument('--wal', action='store_true', help='SQLite im WAL Modus öffnen')
+    parser.add_argument('--json', help='Ladelisten als JSON speichern')
+    parser.add_argument('--csv', help='Ladelisten als CSV speichern')
+    args = parser.parse_args()
+
+    db = Database(args.database, args.wal)
+    result = do_packing(db, args.strategy, args.time_budget, local_search=args.local_search)
+    db.close()
+
+    if args.sensitivity:
+        print_sensitivity(result)
+    if args.json:
+        write_json(result, args.json)
+    if args.csv:
+        write_csv(result, args.csv)
+
+
+if __name__ == '__main__':
+    main()
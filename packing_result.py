@@ -0,0 +1,94 @@
+# Packing Result class: the loads of a packing run,
+# together with the proven upper bound of the total benefit
+class PackingResult:
+    def __init__(self, loads, upper_bound=None):
+        self.loads = loads
+        self.upper_bound = upper_bound
+
+        # default values
+        self.engine = None
+        self.runtime = 0
+        self.transporter = []
+        self.preprocessing = []
+        self.devices = []
+        self.sensitivity = None
+
+    # returns a list of (device, units) tuples for every transporter
+    def get_loads(self):
+        return self.loads
+
+    # returns the transporter objects with the packed loads
+    def get_transporter(self):
+        return self.transporter
+
+    def set_transporter(self, t):
+        self.transporter = t
+
+    # returns the name of the strategy that packed the loads
+    def get_engine(self):
+        return self.engine
+
+    def set_engine(self, e):
+        self.engine = e
+
+    # returns the solving time in seconds
+    def get_runtime(self):
+        return self.runtime
+
+    def set_runtime(self, r):
+        self.runtime = r
+
+    # returns the (step, devices before, devices after) tuples of the preprocessing
+    def get_preprocessing(self):
+        return self.preprocessing
+
+    def set_preprocessing(self, p):
+        self.preprocessing = p
+
+    # returns the device objects after packing, the units are the unpacked units
+    def get_devices(self):
+        return self.devices
+
+    def set_devices(self, d):
+        self.devices = d
+        self.sensitivity = None
+
+    # returns the marginal values of the packing, see "sensitivity.Sensitivity"
+    # the sensitivity is only calculated once for all questions
+    def get_sensitivity(self):
+        if self.sensitivity is None:
+            from sensitivity import Sensitivity
+            self.sensitivity = Sensitivity(self.devices, self.transporter)
+        return self.sensitivity
+
+    # returns the total benefit ("Nutzwert") of all loads
+    def get_benefit(self):
+        benefit = 0
+        for load in self.loads:
+            for device, units in load:
+                benefit = benefit + device.get_benefit() * units
+        return benefit
+
+    # returns the upper bound, no packing can have a higher benefit
+    def get_upper_bound(self):
+        return self.upper_bound
+
+    def set_upper_bound(self, b):
+        self.upper_bound = b
+
+    # returns the relative gap between the benefit and the upper bound
+    # 0 means the packing is optimal
+    def get_gap(self):
+        if not self.upper_bound:
+            return 0
+        return max(self.upper_bound - self.get_benefit(), 0) / self.upper_bound
+
+    # print the strategy, the total benefit and the gap to the console
+    def print_report(self):
+        print('-> Verfahren: ' + str(self.get_engine()) + ' (' + str(round(self.get_runtime(), 3)) + ' s)')
+        for step, before, after in self.get_preprocessing():
+            print('-> Vorverarbeitung ' + step + ': ' + str(before) + ' -> ' + str(after) + ' Geräte')
+        print('-> ges. Nutzwert aller Transporter: ' + str(self.get_benefit()))
+        print('-> obere Schranke: ' + str(self.get_upper_bound()))
+        print('-> Optimalitätslücke: ' + str(round(self.get_gap() * 100, 2)) + ' %')
+        print('\n')
@@ -0,0 +1,155 @@
+import math
+import bisect
+
+from device import Device
+from packing_result import PackingResult
+
+
+# Reduced Instance class: makes the instance smaller before solving
+# 1. devices that can't be packed are removed
+# 2. devices with the same weight and benefit are merged
+# 3. dominated devices are removed
+# 4. weights and capacities are divided by the greatest common divisor of the weights
+# the solvers pack the reduced devices, "expand" returns the loads with the original devices
+# progress: a "progress.Progress" that is checked for a cancel before every step
+class ReducedInstance:
+    def __init__(self, devices, capacities, progress=None):
+        self.original_devices = devices
+        self.original_capacities = capacities
+
+        # default values
+        # every reduced device has a group of original devices
+        self.devices = []
+        self.groups = []
+        self.capacities = list(capacities)
+        self.gcd = 1
+        # (step, devices before, devices after) for every step
+        self.report = []
+
+        for step in [self.remove_unpackable, self.merge_identical, self.remove_dominated, self.scale_weights]:
+            if progress:
+                progress.check()
+            step()
+
+    # returns the reduced devices
+    def get_devices(self):
+        return self.devices
+
+    # returns the reduced capacities
+    def get_capacities(self):
+        return self.capacities
+
+    # returns a list of (step, devices before, devices after) tuples
+    def get_report(self):
+        return self.report
+
+    # removes devices without units, without benefit or heavier than every transporter
+    def remove_unpackable(self):
+        max_capacity = max([math.floor(max(c, 0)) for c in self.capacities] + [0])
+        before = len(self.original_devices)
+        for device in self.original_devices:
+            if device.get_units() > 0 and device.get_benefit() > 0 and device.get_weight() <= max_capacity:
+                self.devices.append(device)
+                self.groups.append([device])
+        self.report.append(('unpackable', before, len(self.devices)))
+
+    # merges devices with the same weight and benefit to one device
+    def merge_identical(self):
+        before = len(self.devices)
+        merged = {}
+        devices = []
+        groups = []
+        for device, group in zip(self.devices, self.groups):
+            key = (device.get_weight(), device.get_benefit())
+            if key in merged:
+                i = merged[key]
+                devices[i].set_units(devices[i].get_units() + device.get_units())
+                groups[i] = groups[i] + group
+            else:
+                merged[key] = len(devices)
+                devices.append(Device(device.get_id(), device.get_name(), device.get_units(), device.get_weight(),
+                                      device.get_benefit()))
+                groups.append(group)
+        self.devices = devices
+        self.groups = groups
+        self.report.append(('identical', before, len(self.devices)))
+
+    # removes devices that are never needed in an optimal packing:
+    # a device is dominated by lighter devices with a higher benefit,
+    # it is only packed if all units of these devices are packed,
+    # so it can be removed if they don't fit on the fleet together with one unit of the device
+    def remove_dominated(self):
+        before = len(self.devices)
+        total_capacity = sum(max(c, 0) for c in self.capacities)
+
+        # Fenwick tree over the benefit ranks (highest benefit first):
+        # sum of the weight of all units of the kept devices with at least the benefit
+        benefits = sorted({-device.get_benefit() for device in self.devices})
+        tree = [0] * (len(benefits) + 1)
+
+        kept = []
+        order = sorted(range(len(self.devices)),
+                       key=lambda i: (self.devices[i].get_weight(), -self.devices[i].get_benefit()))
+        for i in order:
+            device = self.devices[i]
+            rank = bisect.bisect_left(benefits, -device.get_benefit()) + 1
+
+            # weight of the units of the lighter devices with a higher benefit
+            # (same weight and benefit is merged, so every device in the sum dominates this device)
+            dominating_weight = 0
+            r = rank
+            while r > 0:
+                dominating_weight = dominating_weight + tree[r]
+                r = r - (r & -r)
+
+            if dominating_weight + device.get_weight() > total_capacity:
+                continue
+
+            kept.append(i)
+            r = rank
+            while r < len(tree):
+                tree[r] = tree[r] + device.get_weight() * device.get_units()
+                r = r + (r & -r)
+
+        kept.sort()
+        self.devices = [self.devices[i] for i in kept]
+        self.groups = [self.groups[i] for i in kept]
+        self.report.append(('dominated', before, len(self.devices)))
+
+    # divides the weights by their greatest common divisor,
+    # the capacities are rounded down to a multiple of it
+    def scale_weights(self):
+        weights = [device.get_weight() for device in self.devices]
+        gcd = 0
+        if all(float(w).is_integer() for w in weights):
+            for w in weights:
+                gcd = math.gcd(gcd, int(w))
+
+        if gcd > 1:
+            self.gcd = gcd
+            self.devices = [Device(d.get_id(), d.get_name(), d.get_units(), int(d.get_weight()) // gcd,
+                                   d.get_benefit()) for d in self.devices]
+            self.capacities = [math.floor(max(c, 0)) // gcd for c in self.capacities]
+        self.report.append(('gcd ' + str(self.gcd), len(self.devices), len(self.devices)))
+
+    # returns the result with the loads of the original devices
+    # the units of a merged device are split to the original devices
+    def expand(self, result):
+        units = {id(device): device.get_units() for device in self.original_devices}
+        index = {id(device): i for i, device in enumerate(self.devices)}
+
+        loads = []
+        for load in result.get_loads():
+            expanded = []
+            for device, u in load:
+                for original in self.groups[index[id(device)]]:
+                    packed = min(u, units[id(original)])
+                    if packed > 0:
+                        expanded.append((original, packed))
+                        units[id(original)] = units[id(original)] - packed
+                        u = u - packed
+            loads.append(expanded)
+
+        expanded_result = PackingResult(loads, result.get_upper_bound())
+        expanded_result.set_preprocessing(self.report)
+        return expanded_result
@@ -0,0 +1,43 @@
+import threading
+
+
+# raised in the packing when the user cancels it
+class PackingCancelled(Exception):
+    pass
+
+
+# Progress class: state of a packing run that is shared between
+# the worker thread (packing) and the GUI thread (shows the progress)
+# the solvers call "update" and stop with "PackingCancelled" after "cancel" was called
+class Progress:
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        # default values
+        self.transporter_done = 0
+        self.transporter_count = 0
+        self.benefit = 0
+        self.cancelled = False
+
+    # saves the progress: packed transporters and the best benefit so far
+    # raises "PackingCancelled" if the packing was cancelled
+    def update(self, transporter_done, transporter_count, benefit):
+        with self.lock:
+            self.transporter_done = transporter_done
+            self.transporter_count = transporter_count
+            self.benefit = benefit
+        self.check()
+
+    # raises "PackingCancelled" if the packing was cancelled
+    def check(self):
+        if self.cancelled:
+            raise PackingCancelled()
+
+    # cancels the packing, the solver stops at the next update
+    def cancel(self):
+        self.cancelled = True
+
+    # returns (transporter done, transporter count, benefit)
+    def get_state(self):
+        with self.lock:
+            return self.transporter_done, self.transporter_count, self.benefit
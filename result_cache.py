@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+
+# returns the cache key of the values, e.g. the fingerprint of the catalog and the solver settings
+# the values must be JSON serializable
+def get_key(*values):
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# Result Cache class: saves packing results by key, so the same instance isn't solved again
+# the results must be JSON serializable (plain values, no objects)
+# - memory: the last "max_entries" results (least recently used are removed first)
+# - disk: one JSON file per result in the directory, up to "max_bytes"
+#   the least recently used files are removed first, so the cache can be shared by runs
+class ResultCache:
+    def __init__(self, directory=None, max_entries=100, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # default values
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # returns the path of the file for the key
+    def get_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    # returns the result of the key, None if the key is not in the cache
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits = self.hits + 1
+            return self.entries[key]
+
+        if self.directory and os.path.exists(self.get_path(key)):
+            try:
+                with open(self.get_path(key), encoding='utf-8') as f:
+                    value = json.load(f)
+            except (OSError, ValueError):
+                # broken or removed file, e.g. by an other process
+                self.misses = self.misses + 1
+                return None
+            # mark the file as used for the LRU order
+            os.utime(self.get_path(key))
+            self.put_memory(key, value)
+            self.hits = self.hits + 1
+            return value
+
+        self.misses = self.misses + 1
+        return None
+
+    # saves the result in memory and on disk
+    def put(self, key, value):
+        self.put_memory(key, value)
+        if self.directory:
+            # write to a temporary file first, so no process reads a half written file
+            path = self.get_path(key)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(path + '.tmp', path)
+            self.clean_disk()
+
+    # saves the result in memory, removes the least recently used results
+    def put_memory(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    # removes the least recently used files until the size bound is kept
+    def clean_disk(self):
+        files = []
+        total = 0
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.json'):
+                path = os.path.join(self.directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total = total + stat.st_size
+        files.sort()
+        for mtime, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total = total - size
+
+    # removes all results
+    def clear(self):
+        self.entries.clear()
+        if self.directory:
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.json'):
+                    os.remove(os.path.join(self.directory, filename))
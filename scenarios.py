@@ -0,0 +1,152 @@
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from device import Device
+from driver import Driver
+from transporter import Transporter
+from packing import get_upper_bound
+from strategies import AUTO, solve
+from result_cache import get_key
+
+
+# Scenario class: one "what if" packing problem
+# only plain values are saved, so the scenario can be sent to other processes
+class Scenario:
+    def __init__(self, name, devices, transporter, driver, demand=1, strategy=AUTO, time_budget=2, snapshot=None):
+        self.name = name
+        # (ID, name, units, weight, benefit) for every device
+        self.devices = devices
+        # directory of a catalog snapshot, used instead of the devices,
+        # the processes share the mapped snapshot instead of getting a copy of the devices
+        self.snapshot = snapshot
+        # (ID, capacity in kg) for every transporter
+        self.transporter = transporter
+        # (ID, weight in kg) for every driver
+        self.driver = driver
+        # multiplier for the units of every device
+        self.demand = demand
+        self.strategy = strategy
+        self.time_budget = time_budget
+
+    # returns the name
+    def get_name(self):
+        return self.name
+
+
+# creates a scenario from the database
+# transporter and driver: lists of the objects, all of the database by default
+# snapshot: directory of a catalog snapshot of the database, see "catalog_snapshot.write_snapshot"
+def create_scenario(db, name, demand=1, transporter=None, driver=None, strategy=AUTO, time_budget=2, snapshot=None):
+    if transporter is None:
+        transporter = db.get_transporter()
+    if driver is None:
+        driver = db.get_driver()
+    devices = None
+    if snapshot is None:
+        devices = [(d.get_id(), d.get_name(), d.get_units(), d.get_weight(), d.get_benefit())
+                   for d in db.get_devices(sorted=True)]
+    return Scenario(name, devices, [(t.get_id(), t.get_total_capacity_kg()) for t in transporter],
+                    [(d.get_id(), d.get_weight_kg()) for d in driver], demand, strategy, time_budget, snapshot)
+
+
+# packs the scenario, like "packer.do_packing" without database
+# returns a dict with the results, it can be sent back to the main process
+def evaluate_scenario(scenario):
+    catalog = None
+    if scenario.snapshot:
+        # numpy is only imported if a snapshot is used
+        from catalog_snapshot import Snapshot
+        catalog = Snapshot(scenario.snapshot).get_catalog(scenario.demand)
+        devices = catalog.get_devices()
+    else:
+        devices = []
+        for device_id, name, units, weight, benefit in scenario.devices:
+            devices.append(Device(device_id, name, math.floor(int(units) * scenario.demand), weight, benefit))
+
+    # every transporter gets the next driver
+    transporter_list = []
+    for (transporter_id, capacity), (driver_id, weight) in zip(scenario.transporter, scenario.driver):
+        transporter = Transporter(transporter_id, capacity)
+        transporter.add_driver(Driver(driver_id, weight))
+        transporter_list.append(transporter)
+
+    capacities = [transporter.get_reaming_capacity() for transporter in transporter_list]
+    result = solve(scenario.strategy, devices, capacities, scenario.time_budget)
+    if result.get_upper_bound() is None:
+        if catalog:
+            # the bound of the catalog is calculated with array operations
+            result.set_upper_bound(catalog.get_upper_bound(capacities))
+        else:
+            result.set_upper_bound(get_upper_bound(devices, capacities))
+
+    # the loads of a catalog are (device index, units) arrays
+    load_arrays = None
+    if catalog:
+        load_arrays = catalog.get_load_arrays(result.get_loads())
+
+    loads = []
+    for t, (transporter, load) in enumerate(zip(transporter_list, result.get_loads())):
+        for device, units in load:
+            transporter.pack_device(device, units)
+        if catalog:
+            load = list(zip(catalog.ids[load_arrays[t][:, 0]].tolist(), load_arrays[t][:, 1].tolist()))
+        else:
+            load = [(device.get_id(), units) for device, units in load]
+        loads.append({
+            'transporter_id': transporter.get_id(),
+            'driver_id': transporter.get_driver().get_id(),
+            'benefit': transporter.get_benefit(),
+            'free_capacity': round(transporter.get_reaming_capacity()),
+            'load': load,
+        })
+
+    return {
+        'name': scenario.get_name(),
+        'engine': result.get_engine(),
+        'runtime': result.get_runtime(),
+        'benefit': result.get_benefit(),
+        'upper_bound': result.get_upper_bound(),
+        'gap': result.get_gap(),
+        'transporter': loads,
+    }
+
+
+# returns the key of the scenario in the result cache
+# a snapshot is identified by the fingerprint of its catalog
+def get_scenario_key(scenario):
+    devices = scenario.devices
+    if scenario.snapshot:
+        from catalog_snapshot import Snapshot
+        devices = Snapshot(scenario.snapshot).get_fingerprint()
+    return get_key(devices, scenario.transporter, scenario.driver, scenario.demand, scenario.strategy,
+                   scenario.time_budget)
+
+
+# evaluates the scenarios on all cores
+# the results are returned as soon as a scenario is done (not in the given order)
+# workers: number of processes, the number of cores by default
+# cache: a "result_cache.ResultCache", scenarios that were already evaluated are not packed again
+def evaluate_scenarios(scenarios, workers=None, cache=None):
+    keys = {}
+    unsolved = []
+    for scenario in scenarios:
+        if cache:
+            key = get_scenario_key(scenario)
+            result = cache.get(key)
+            if result:
+                # the name can be different for the same instance
+                result = dict(result, name=scenario.get_name())
+                yield result
+                continue
+            keys[id(scenario)] = key
+        unsolved.append(scenario)
+    if len(unsolved) == 0:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(evaluate_scenario, scenario): scenario for scenario in unsolved}
+        for future in as_completed(futures):
+            result = future.result()
+            if cache:
+                cache.put(keys[id(futures[future])], result)
+            yield result
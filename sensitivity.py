@@ -0,0 +1,113 @@
+import math
+
+
+# Sensitivity class: answers marginal value questions for a packing
+# e.g. "how much benefit would one more kg on transporter 2 buy?"
+# or "how many units of a device are worth adding to the demand?"
+# the shadow prices come from the fractional (LP) relaxation of the whole fleet,
+# the exact value of more capacity on one transporter from its DP profile,
+# which is calculated once per transporter and then reused for every question
+class Sensitivity:
+    def __init__(self, devices, transporter_list, max_extra_kg=100):
+        # devices after packing: the units are the unpacked units
+        self.devices = devices
+        self.transporter_list = [t for t in transporter_list if t.get_driver()]
+        self.max_extra_kg = max_extra_kg
+
+        # units of every device before packing
+        self.packed = {}
+        for transporter in self.transporter_list:
+            for device, units in transporter.get_load():
+                self.packed[device.get_id()] = self.packed.get(device.get_id(), 0) + units
+
+        # default values
+        self.profiles = {}
+        self.capacity_price = 0
+        # capacity of the LP solution that is used by devices with a lower ratio than the device
+        self.lower_capacity = {}
+
+        self.solve_relaxation()
+
+    # returns the units of the device before packing
+    def get_total_units(self, device):
+        return device.get_units() + self.packed.get(device.get_id(), 0)
+
+    # returns the device with the name
+    def find_device(self, name):
+        for device in self.devices:
+            if device.get_name() == name:
+                return device
+        return None
+
+    # packs the fractional relaxation of all transporters together:
+    # the devices are packed in ratio order, until the capacity is full
+    # the ratio of the last packed device is the shadow price of the capacity
+    def solve_relaxation(self):
+        capacity = sum(t.get_total_capacity() - t.get_driver().get_weight() for t in self.transporter_list)
+        order = sorted([d for d in self.devices if d.get_benefit() > 0],
+                       key=lambda d: d.get_benefit() / d.get_weight(), reverse=True)
+
+        used = []
+        for device in order:
+            if capacity <= 0:
+                break
+            weight = min(device.get_weight() * self.get_total_units(device), capacity)
+            used.append((device, weight))
+            capacity = capacity - weight
+            if capacity <= 0:
+                # the capacity is full: this is the critical device
+                self.capacity_price = device.get_benefit() / device.get_weight()
+
+        # free capacity for every device, and the capacity of the devices with a lower ratio,
+        # this capacity could be used by more units of a device with a higher ratio
+        free = max(capacity, 0)
+        lower = free
+        for device, weight in reversed(used):
+            self.lower_capacity[device.get_id()] = lower
+            lower = lower + weight
+        for device in self.devices:
+            if device.get_id() not in self.lower_capacity:
+                self.lower_capacity[device.get_id()] = lower if device.get_benefit() > 0 else 0
+
+    # returns the benefit of one more kg capacity on any transporter (LP shadow price)
+    def get_capacity_price(self):
+        return self.capacity_price * 1000
+
+    # returns the benefit of one more unit of the device in the demand (LP shadow price)
+    def get_device_price(self, device):
+        return max(device.get_benefit() - self.capacity_price * device.get_weight(), 0)
+
+    # returns how many more units of the device are worth adding to the demand:
+    # the units that could replace devices with a lower ratio or use free capacity
+    def get_units_worth_adding(self, device):
+        if self.get_device_price(device) <= 0 and self.capacity_price > 0:
+            return 0
+        return math.floor(self.lower_capacity.get(device.get_id(), 0) / device.get_weight())
+
+    # returns the exact benefit of more capacity on the transporter
+    # the transporter can take its own load and the unpacked units
+    # extra_kg: more capacity in kg, up to "max_extra_kg"
+    # a transporter without driver isn't packed, so more capacity has no value (0)
+    def get_transporter_capacity_value(self, transporter, extra_kg=1):
+        if transporter.get_driver() is None:
+            return 0
+
+        # numpy is only imported if the DP profile is needed
+        from knapsack import get_profile, split_units
+
+        if transporter.get_id() not in self.profiles:
+            units = {device.get_id(): device.get_units() for device in self.devices}
+            for device, packed_units in transporter.get_load():
+                units[device.get_id()] = units[device.get_id()] + packed_units
+
+            devices = [d for d in self.devices if d.get_benefit() > 0]
+            weights = [max(math.ceil(d.get_weight()), 1) for d in devices]
+            benefits = [d.get_benefit() for d in devices]
+            capacity = math.floor(transporter.get_total_capacity() - transporter.get_driver().get_weight())
+            max_capacity = capacity + math.floor(self.max_extra_kg * 1000)
+            packets = split_units(weights, [units[d.get_id()] for d in devices], max_capacity)
+            self.profiles[transporter.get_id()] = (capacity, get_profile(weights, benefits, packets, max_capacity))
+
+        capacity, profile = self.profiles[transporter.get_id()]
+        extra = min(math.floor(extra_kg * 1000), len(profile) - 1 - capacity)
+        return (profile[capacity + extra] - profile[capacity]).item()
@@ -0,0 +1,114 @@
+import math
+import time
+import importlib
+
+from local_search import improve
+from preprocessing import ReducedInstance
+
+# registry of the packing strategies:
+# name -> (module, function), the module is only imported when the strategy is used,
+# so e.g. numpy is not loaded for the greedy algorithm
+STRATEGIES = {
+    'greedy': ('packing', 'pack_greedy'),
+    'fleet_greedy': ('packing', 'pack_fleet_greedy'),
+    'dp': ('knapsack', 'pack_knapsack'),
+    'branch_and_bound': ('branch_and_bound', 'pack_branch_and_bound'),
+}
+
+# name of the strategy that selects the solver by the instance size
+AUTO = 'auto'
+
+# maximum number of DP cells (binary split packets * capacity in g),
+# about 1-2 seconds with numpy
+DP_MAX_CELLS = 2 * 10 ** 8
+
+# maximum number of transporters * devices for the greedy algorithm,
+# bigger instances are packed with the priority queue of the fleet greedy algorithm
+GREEDY_MAX_CELLS = 10 ** 6
+
+# maximum number of search levels (transporters * devices) for branch and bound,
+# more levels make the bounds too weak to improve the greedy solution
+BRANCH_AND_BOUND_MAX_LEVELS = 5000
+
+
+# adds a new strategy to the registry
+def register_strategy(name, module, function):
+    STRATEGIES[name] = (module, function)
+
+
+# returns the solver function of the strategy
+def get_solver(name):
+    module, function = STRATEGIES[name]
+    return getattr(importlib.import_module(module), function)
+
+
+# returns the number of DP cells to pack all transporters
+# the packets are counted once with the biggest capacity, so it's an upper estimate
+def get_dp_cells(devices, capacities):
+    capacity = math.floor(max(list(capacities) + [0]))
+    packets = 0
+    for device in devices:
+        units = min(device.get_units(), capacity // max(math.ceil(device.get_weight()), 1))
+        if units > 0:
+            packets = packets + units.bit_length()
+    return packets * sum(math.floor(max(c, 0)) for c in capacities)
+
+
+# returns the name of the best strategy for the instance size:
+# device count, total units, capacity in g and fleet size
+def select_strategy(devices, capacities):
+    total_units = sum(max(device.get_units(), 0) for device in devices)
+    if len(devices) == 0 or total_units == 0 or len(capacities) == 0:
+        return 'greedy'
+
+    # every device fits on the first transporter: the greedy algorithm is optimal
+    total_weight = sum(device.get_weight() * max(device.get_units(), 0) for device in devices)
+    if total_weight <= capacities[0]:
+        return 'greedy'
+
+    # pack all transporters together if the search tree is small enough
+    if len(capacities) > 1 and len(capacities) * len(devices) <= BRANCH_AND_BOUND_MAX_LEVELS:
+        return 'branch_and_bound'
+
+    if get_dp_cells(devices, capacities) <= DP_MAX_CELLS:
+        return 'dp'
+    if len(capacities) * len(devices) > GREEDY_MAX_CELLS:
+        return 'fleet_greedy'
+    return 'greedy'
+
+
+# packs the transporters with the strategy
+# records the used strategy and the runtime in the result
+# preprocess: make the instance smaller before solving, see "preprocessing.ReducedInstance"
+# local_search: improve the packing afterwards, see "local_search.LocalSearch"
+# progress: a "progress.Progress" for the solver, the solver stops if the packing is cancelled
+def solve(strategy, devices, capacities, time_budget=None, preprocess=True, local_search=False, progress=None):
+    start = time.perf_counter()
+    original_devices = devices
+    original_capacities = capacities
+    instance = None
+    if preprocess:
+        instance = ReducedInstance(devices, capacities, progress)
+        devices = instance.get_devices()
+        capacities = instance.get_capacities()
+
+    if strategy == AUTO:
+        strategy = select_strategy(devices, capacities)
+
+    if progress:
+        result = get_solver(strategy)(devices, capacities, time_budget, progress)
+    else:
+        # registered solvers without progress have only three parameters
+        result = get_solver(strategy)(devices, capacities, time_budget)
+    if instance:
+        result = instance.expand(result)
+    if local_search:
+        # the local search only gets the rest of the time budget
+        rest = None
+        if time_budget is not None:
+            rest = max(time_budget - (time.perf_counter() - start), 0)
+        result = improve(result, original_devices, original_capacities, rest, progress=progress)
+        strategy = strategy + ' + local_search'
+    result.set_engine(strategy)
+    result.set_runtime(time.perf_counter() - start)
+    return result
@@ -7,6 +7,8 @@ class TableWindow:
         # default values
         self.objects = []
         self.row_vars = []
+        self.row_values_loaded = []
+        self.changed_rows = set()
         self.master = None
         self.row_elements = [[]]
         self.new_object_vars = []
@@ -52,12 +54,45 @@ class TableWindow:
     def clear(self):
         self.objects = []
         self.row_vars = []
+        self.row_values_loaded = []
+        self.changed_rows = set()
         self.row_elements = [[]]
 
         # remove input boxes, buttons and labels
         for widget in self.master.winfo_children():
             widget.destroy()
 
+    # marks the row as changed, called when a StringVar of the row is written
+    def on_change(self, row):
+        self.changed_rows.add(row)
+
+    # returns (row index, values) for every row that was changed by the user
+    # rows that were edited back to the loaded values are not returned
+    def get_changed_rows(self):
+        changed = []
+        for row in sorted(self.changed_rows):
+            values = [var.get() for var in self.row_vars[row]]
+            if values != [str(value) for value in self.row_values_loaded[row]]:
+                changed.append((row, values))
+        return changed
+
+    # returns True if the window wasn't closed
+    def is_open(self):
+        return self.master.winfo_exists()
+
+    # hides the window and the window to create a new entry,
+    # e.g. while the packing thread uses the database
+    def hide(self):
+        for window in [self.master, self.new_object_window]:
+            if window and window.winfo_exists():
+                window.withdraw()
+
+    # shows the hidden windows again
+    def show(self):
+        for window in [self.master, self.new_object_window]:
+            if window and window.winfo_exists():
+                window.deiconify()
+
     # close callback
     def on_close(self):
         print('on close')
@@ -98,6 +133,7 @@ class TableWindow:
 
         # remove old entries
         self.clear()
+        self.row_values_loaded = row_values
 
         # render background color for selection
         self.selected_background_color = Label(self.master, text='', fg='#3A3A3C', bg="#3A3A3C", font='Arial 13 bold')
@@ -123,6 +159,8 @@ class TableWindow:
             for value in row:
                 # render input box
                 var = StringVar(self.master, value=value)
+                # track the changes of the row, only changed rows are saved
+                var.trace_add('write', lambda *args, row=i - 1: self.on_change(row))
                 input_box = Entry(self.master, textvariable=var, fg='white', bg='#2C2C2E',
                                   highlightbackground='#2C2C2E', highlightcolor='#2C2C2E', highlightthickness=2,
                                   borderwidth=1)
@@ -1,15 +1,21 @@
 import math
 import table
+from array import array
 
 
 class Transporter:
+    __slots__ = ('id', 'capacity', 'reaming_capacity', 'benefit', 'load_devices', 'load_units', 'driver')
+
     def __init__(self, transporter_id, capacity):
         self.id = transporter_id
         self.capacity = capacity
 
         self.reaming_capacity = self.get_total_capacity()
         self.benefit = 0
-        self.load = []
+        # the load: packed devices and a compact array of the packed units
+        self.load_devices = []
+        self.load_units = array('q')
+        self.driver = None
 
     # returns the ID
     def get_id(self):
@@ -36,8 +42,13 @@ class Transporter:
     def get_benefit(self):
         return self.benefit
 
+    # returns the driver, None if the transporter has no driver
+    def get_driver(self):
+        return self.driver
+
     # subtracts the weight of the driver from the reaming capacity
     def add_driver(self, driver):
+        self.driver = driver
         self.reaming_capacity = self.reaming_capacity - driver.get_weight()
 
     # returns the maximum number of devices that can be packed on the transporter
@@ -54,10 +65,12 @@ class Transporter:
     def pack_device(self, device, units):
         self.benefit = self.benefit + device.get_benefit() * units
         self.reaming_capacity = self.reaming_capacity - device.get_weight() * units
-        self.load.append({'device': device, 'units': units})
+        self.load_devices.append(device)
+        self.load_units.append(units)
 
+    # returns the load as list of (device, units) tuples
     def get_load(self):
-        return self.load
+        return list(zip(self.load_devices, self.load_units))
 
     # print the current load to the console
     def print_load(self):
@@ -65,8 +78,8 @@ class Transporter:
             ['Gerät', 'Anzahl'],
         ]
 
-        for l in self.load:
-            table_load_list.append([l['device'].get_name(), l['units']])
+        for device, units in self.get_load():
+            table_load_list.append([device.get_name(), units])
 
         print('TRANSPORTER NR.' + str(self.get_id() + 1))
         table.printTable(table_load_list, useFieldNames=True)
@@ -43,10 +43,11 @@ class TransporterGUI(TableWindow):
 
     # done button callback
     def on_done(self):
-        i = -1
-        for row in self.row_vars:
-            self.db.update_transporter(self.transporter[i], row[0].get())
-            i = i + 1
+        # save only the changed rows
+        changes = []
+        for i, row in self.get_changed_rows():
+            changes.append((self.transporter[i], row[0]))
+        self.db.update_transporters(changes)
         self.master.destroy()
 
     # creates a new transporter